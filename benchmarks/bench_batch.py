@@ -0,0 +1,78 @@
+"""Benchmark constructing one kind many times, looped or batched.
+
+A static-site build renders a list item per entry (props) and a heading
+per page (contexts). Compare calling ``get`` in a loop, with a child
+registry per page for contexts, to ``get_batch``.
+
+Run with ``python benchmarks/bench_batch.py``.
+"""
+from dataclasses import dataclass
+from timeit import timeit
+
+from hopscotch import Registry
+from hopscotch.operators import context
+
+
+@dataclass()
+class Page:
+    """The per-page context."""
+
+    title: str = "Home"
+
+
+@dataclass()
+class Site:
+    """A registered singleton dependency."""
+
+    title: str = "My Site"
+
+
+@dataclass()
+class ListItem:
+    """Constructed once per entry, with props."""
+
+    label: str
+    site: Site
+
+
+@dataclass()
+class Heading:
+    """Constructed once per page, with a context."""
+
+    site: Site
+    page: Page = context()
+
+
+def main() -> None:
+    """Print the per-item cost of each way."""
+    registry = Registry()
+    registry.register(Site())
+    registry.register(ListItem)
+    registry.register(Heading)
+    props = [{"label": f"Item {index}"} for index in range(1_000)]
+    pages = [Page(title=f"Page {index}") for index in range(1_000)]
+    number = 20
+
+    def props_loop() -> None:
+        for these_props in props:
+            registry.get(ListItem, **these_props)
+
+    def props_batch() -> None:
+        registry.get_batch(ListItem, props=props)
+
+    def contexts_loop() -> None:
+        for page in pages:
+            Registry(parent=registry, context=page).get(Heading)
+
+    def contexts_batch() -> None:
+        registry.get_batch(Heading, contexts=pages)
+
+    print(f"{'scenario':>16} {'µs/item':>8}")
+    for scenario in (props_loop, props_batch, contexts_loop, contexts_batch):
+        elapsed = timeit(scenario, number=number)
+        per_item = elapsed / number / len(props) * 1e6
+        print(f"{scenario.__name__:>16} {per_item:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark registering many components, one at a time or in bulk.
+
+A scan of a big package registers thousands of components. Compare
+50,000 ``register`` calls, spread over a few hundred kinds and contexts,
+with the same calls in a ``bulk`` block and with ``register_many``.
+
+Run with ``python benchmarks/bench_bulk_registration.py``.
+"""
+from dataclasses import dataclass
+from dataclasses import make_dataclass
+from time import perf_counter
+
+from hopscotch import Registry
+
+COMPONENTS = 50_000
+KINDS = 200
+CONTEXTS = 5
+
+
+@dataclass()
+class Base:
+    """Every generated kind subclasses this."""
+
+    title: str = "Component"
+
+
+def make_components() -> list[tuple[type, type, type]]:
+    """Make (implementation, kind, context) triples to register."""
+    kinds = [
+        make_dataclass(f"Kind{index}", (), bases=(Base,)) for index in range(KINDS)
+    ]
+    contexts = [make_dataclass(f"Context{index}", ()) for index in range(CONTEXTS)]
+    components = []
+    for index in range(COMPONENTS):
+        kind = kinds[index % KINDS]
+        implementation = make_dataclass(f"Component{index}", (), bases=(kind,))
+        components.append((implementation, kind, contexts[index % CONTEXTS]))
+    return components
+
+
+def main() -> None:
+    """Print the time to register all components each way."""
+    components = make_components()
+    by_kind: dict[type, list[type]] = {}
+    for implementation, kind, _ in components:
+        by_kind.setdefault(kind, []).append(implementation)
+
+    def one_at_a_time(registry: Registry) -> None:
+        for implementation, kind, context in components:
+            registry.register(implementation, kind=kind, context=context)
+
+    def bulk(registry: Registry) -> None:
+        with registry.bulk():
+            one_at_a_time(registry)
+
+    def register_many(registry: Registry) -> None:
+        for kind, implementations in by_kind.items():
+            registry.register_many(implementations, kind=kind)
+
+    print(f"{'scenario':>14} {'seconds':>8}")
+    for scenario in (one_at_a_time, bulk, register_many):
+        registry = Registry()
+        # A child registry, as a site has, to be told about each change.
+        child = Registry(parent=registry)
+        child.register(Base)
+        start = perf_counter()
+        scenario(registry)
+        elapsed = perf_counter() - start
+        print(f"{scenario.__name__:>14} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark creating and discarding per-request child registries.
+
+A long-lived parent holds the site's registrations. Each "request"
+makes a child with a context, optionally registers a singleton or two,
+gets a component, then throws the child away.
+
+Run with ``python benchmarks/bench_child_registries.py``.
+"""
+from dataclasses import dataclass
+from timeit import timeit
+
+from hopscotch import Registry
+
+
+@dataclass()
+class Request:
+    """Stand-in for the per-request singleton."""
+
+    path: str = "/"
+
+
+@dataclass()
+class Page:
+    """Stand-in for the per-request context."""
+
+    title: str = "Home"
+
+
+@dataclass()
+class Heading:
+    """A component registered in the parent."""
+
+    title: str = "Heading"
+
+
+def main() -> None:
+    """Print the per-request cost of child registries."""
+    parent = Registry()
+    parent.register(Heading)
+    parent.commit()
+    page = Page()
+    request = Request()
+    number = 10_000
+
+    def create() -> None:
+        Registry(parent=parent, context=page)
+
+    def create_get() -> None:
+        Registry(parent=parent, context=page).get(Heading)
+
+    def create_register_get() -> None:
+        child = Registry(parent=parent, context=page)
+        child.register(request)
+        child.get(Heading)
+        child.get(Request)
+
+    print(f"{'scenario':>22} {'µs/child':>10}")
+    for scenario in (create, create_get, create_register_get):
+        elapsed = timeit(scenario, number=number)
+        print(f"{scenario.__name__:>22} {elapsed / number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark context dispatch for kinds with many context registrations.
+
+Each context class gets its own registration for the same kind. The
+lookup uses the deepest context class, with the resolution cache
+bypassed, so the timing is the cost of walking the MRO. It should stay
+flat as the number of registered contexts grows.
+
+Run with ``python benchmarks/bench_context_dispatch.py``.
+"""
+from dataclasses import dataclass
+from timeit import timeit
+
+from hopscotch import Registry
+
+
+@dataclass()
+class Heading:
+    """The kind being looked up."""
+
+    title: str = "Heading"
+
+
+class Page:
+    """Root of the context class hierarchy."""
+
+
+def make_registry(context_count: int) -> tuple[Registry, type]:
+    """Register ``Heading`` for ``context_count`` unrelated contexts."""
+    registry = Registry()
+    # A short chain of contexts, one of which is the lookup target...
+    section = type("Section", (Page,), {})
+    article = type("Article", (section,), {})
+    registry.register(Heading(title="section"), context=section)
+    # ...buried among many unrelated context registrations.
+    for i in range(context_count):
+        context = type(f"Context{i}", (Page,), {})
+        registry.register(Heading(title=f"context {i}"), context=context)
+    return registry, article
+
+
+# How much slower the most contexts may be than the fewest, allowing
+# for noise, before the lookup no longer counts as flat.
+FLAT_RATIO = 3
+
+
+def main() -> None:
+    """Print per-lookup timings as the context count grows."""
+    number = 20_000
+    print(f"{'contexts':>10} {'µs/lookup':>10}")
+    timings = []
+    for context_count in (10, 100, 1_000, 10_000):
+        registry, article = make_registry(context_count)
+        assert registry.get(Heading, context=article()).title == "section"
+        elapsed = timeit(
+            lambda: registry._find_best_match(Heading, article, True),  # noqa: B023
+            number=number,
+        )
+        timings.append(elapsed)
+        print(f"{context_count:>10} {elapsed / number * 1e6:>10.3f}")
+    assert timings[-1] < timings[0] * FLAT_RATIO, "Lookups grow with contexts"
+
+
+if __name__ == "__main__":
+    main()
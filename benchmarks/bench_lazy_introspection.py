@@ -0,0 +1,97 @@
+"""Benchmark startup of a scan-heavy application, eager vs. lazy.
+
+Generates a package of a few thousand ``@injectable`` components, then
+in fresh processes scans it and gets a single component -- like a CLI
+command or a single-page render that uses a handful of what it scans.
+Module imports happen before the timer starts.
+
+Run with ``python benchmarks/bench_lazy_introspection.py``.
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+MODULE_COUNT = 40
+CLASSES_PER_MODULE = 75
+
+MODULE_HEADER = """\
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from hopscotch import injectable
+
+
+@dataclass()
+class Base:
+    title: str = "Base"
+"""
+
+COMPONENT = """
+
+@injectable()
+@dataclass()
+class Component{i}:
+    parent: Optional[Base] = None
+    title: str = "Component {i}"
+    level: int = {i}
+    tags: list[str] = field(default_factory=list)
+"""
+
+RUNNER = """\
+import importlib
+import sys
+import time
+
+from hopscotch import Registry
+
+lazy = sys.argv[1] == "lazy"
+for m in range({module_count}):
+    importlib.import_module(f"components.module{{m}}")
+from components.module0 import Component0
+
+start = time.perf_counter()
+registry = Registry(lazy_introspection=lazy)
+registry.scan("components")
+scanned = time.perf_counter()
+registry.get(Component0)
+done = time.perf_counter()
+print(scanned - start, done - scanned)
+"""
+
+
+def write_package(root: Path) -> None:
+    """Write the generated component package and runner."""
+    package = root / "components"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for m in range(MODULE_COUNT):
+        body = MODULE_HEADER + "".join(
+            COMPONENT.format(i=i) for i in range(CLASSES_PER_MODULE)
+        )
+        (package / f"module{m}.py").write_text(body)
+    (root / "runner.py").write_text(RUNNER.format(module_count=MODULE_COUNT))
+
+
+def main() -> None:
+    """Print scan and first-get times for eager and lazy introspection."""
+    count = MODULE_COUNT * CLASSES_PER_MODULE
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_package(root)
+        print(f"Scanning {count} components")
+        print(f"{'mode':>6} {'scan ms':>9} {'first get ms':>13}")
+        for mode in ("eager", "lazy"):
+            output = subprocess.check_output(  # noqa: S603
+                [sys.executable, str(root / "runner.py"), mode],
+                cwd=root,
+                text=True,
+            )
+            scan, get = (float(t) * 1000 for t in output.split())
+            print(f"{mode:>6} {scan:>9.1f} {get:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
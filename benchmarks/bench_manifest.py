@@ -0,0 +1,83 @@
+"""Benchmark cold starts: scanning a package or loading its manifest.
+
+Generates a package of 1,000 component modules, writes its manifest,
+then times a new process that either scans the package or loads the
+manifest, and gets one component.
+
+Run with ``python benchmarks/bench_manifest.py``.
+"""
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from hopscotch.manifest import scan_to_manifest
+
+MODULES = 1_000
+
+KINDS = """
+from dataclasses import dataclass
+
+@dataclass()
+class Component:
+    title: str = "Component"
+"""
+
+COMPONENT = """
+from dataclasses import dataclass
+from hopscotch import injectable
+from .kinds import Component
+
+@injectable()
+@dataclass()
+class Component{index}(Component):
+    title: str = "Component {index}"
+"""
+
+COLD_START = """
+from time import perf_counter
+start = perf_counter()
+from hopscotch import Registry
+registry = Registry()
+{setup}
+from bench_components.kinds import Component
+registry.get(Component)
+print(perf_counter() - start)
+"""
+
+
+def cold_start(root: Path, setup: str) -> float:
+    """Run a new process and return its seconds until the first ``get``."""
+    code = COLD_START.format(setup=setup)
+    output = subprocess.check_output(  # noqa: S603
+        [sys.executable, "-B", "-c", code], cwd=root, text=True
+    )
+    return float(output)
+
+
+def main() -> None:
+    """Print the cold start time of each way."""
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        package = root / "bench_components"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "kinds.py").write_text(KINDS)
+        for index in range(MODULES):
+            module = package / f"component_{index}.py"
+            module.write_text(COMPONENT.format(index=index))
+        sys.path.insert(0, tmp)
+        manifest = root / "manifest.json"
+        scan_to_manifest("bench_components", manifest)
+
+        print(f"{'scenario':>14} {'seconds':>8}")
+        for scenario, setup in (
+            ("scan", "registry.scan('bench_components')"),
+            ("load_manifest", f"registry.load_manifest({str(manifest)!r})"),
+        ):
+            elapsed = min(cold_start(root, setup) for _ in range(3))
+            print(f"{scenario:>14} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
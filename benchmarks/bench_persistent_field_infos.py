@@ -0,0 +1,115 @@
+"""Benchmark cold starts with and without a field infos store.
+
+Generates a package of a few thousand dataclass components, then in
+fresh processes registers all of them:
+
+- ``no store``: introspect everything, as without persistence
+- ``store miss``: introspect everything and fill an empty store
+- ``store hit``: load everything from the store filled by the last run
+
+Module imports are not timed, only the registration work.
+
+Run with ``python benchmarks/bench_persistent_field_infos.py``.
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+MODULE_COUNT = 40
+CLASSES_PER_MODULE = 75
+
+MODULE_HEADER = """\
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from hopscotch.operators import context
+
+
+@dataclass()
+class Base:
+    title: str = "Base"
+"""
+
+COMPONENT = """
+
+@dataclass()
+class Component{i}:
+    base: Base
+    page: object = context()
+    parent: Optional[Base] = None
+    title: str = "Component {i}"
+    level: int = {i}
+    tags: list[str] = field(default_factory=list)
+"""
+
+RUNNER = """\
+import importlib
+import sys
+import time
+from dataclasses import is_dataclass
+
+from hopscotch import Registry
+from hopscotch.persistence import FieldInfosStore
+
+mode, store_path = sys.argv[1], sys.argv[2]
+modules = [
+    importlib.import_module(f"components.module{{m}}") for m in range({module_count})
+]
+targets = [
+    v for mod in modules for k, v in vars(mod).items()
+    if k.startswith("Component") and is_dataclass(v)
+]
+registry = Registry()
+start = time.perf_counter()
+if mode == "no store":
+    for target in targets:
+        registry.register(target)
+else:
+    with FieldInfosStore(store_path):
+        for target in targets:
+            registry.register(target)
+print(time.perf_counter() - start)
+"""
+
+
+def write_package(root: Path) -> None:
+    """Write the generated component package and runner."""
+    package = root / "components"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for m in range(MODULE_COUNT):
+        body = MODULE_HEADER + "".join(
+            COMPONENT.format(i=i) for i in range(CLASSES_PER_MODULE)
+        )
+        (package / f"module{m}.py").write_text(body)
+    (root / "runner.py").write_text(RUNNER.format(module_count=MODULE_COUNT))
+
+
+def run(root: Path, mode: str, store_path: Path) -> float:
+    """Run one fresh process and return its registration time."""
+    output = subprocess.check_output(  # noqa: S603
+        [sys.executable, str(root / "runner.py"), mode, str(store_path)],
+        cwd=root,
+        text=True,
+    )
+    return float(output)
+
+
+def main() -> None:
+    """Print the registration time for each mode."""
+    count = MODULE_COUNT * CLASSES_PER_MODULE
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_package(root)
+        store_path = root / "field_infos.pickle"
+        print(f"Registering {count} components")
+        for mode in ("no store", "store miss", "store hit", "store hit"):
+            elapsed = run(root, mode, store_path)
+            print(f"{mode:>12}: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
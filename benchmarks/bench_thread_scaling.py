@@ -0,0 +1,83 @@
+"""Benchmark ``Registry.get`` throughput from 1 to N threads.
+
+Threads share one registry and only read, the common case of a site
+registry serving requests. With the GIL, throughput stays flat as
+threads are added; on a free-threaded build, reads take no lock so it
+should scale with the cores.
+
+Run with ``python benchmarks/bench_thread_scaling.py [max_threads]``.
+"""
+import sys
+from dataclasses import dataclass
+from threading import Barrier
+from threading import Thread
+from time import perf_counter
+
+from hopscotch import Registry
+
+
+@dataclass()
+class Customer:
+    """Stand-in for the per-request context."""
+
+    name: str = "Mary"
+
+
+@dataclass()
+class FrenchCustomer(Customer):
+    """A more specific context."""
+
+
+@dataclass()
+class Heading:
+    """A component registered for the general case."""
+
+    title: str = "Heading"
+
+
+@dataclass()
+class FrenchHeading(Heading):
+    """A component registered for a context."""
+
+    title: str = "Titre"
+
+
+def read(registry: Registry, number: int, barrier: Barrier) -> None:
+    """Get components, as a request would."""
+    customer = FrenchCustomer()
+    barrier.wait()
+    for _ in range(number):
+        registry.get(Heading)
+        registry.get(Heading, context=customer)
+
+
+def main() -> None:
+    """Print gets per second for each number of threads."""
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    registry = Registry()
+    registry.register(Heading)
+    registry.register(FrenchHeading, context=FrenchCustomer)
+    number = 20_000
+
+    print(f"{'threads':>8} {'gets/s':>12}")
+    threads_count = 1
+    while threads_count <= max_threads:
+        barrier = Barrier(threads_count + 1)
+        threads = [
+            Thread(target=read, args=(registry, number, barrier))
+            for _ in range(threads_count)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - start
+        gets = 2 * number * threads_count
+        print(f"{threads_count:>8} {gets / elapsed:>12.0f}")
+        threads_count *= 2
+
+
+if __name__ == "__main__":
+    main()
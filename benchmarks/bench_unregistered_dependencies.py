@@ -0,0 +1,94 @@
+"""Benchmark components whose dependencies are mostly unregistered.
+
+``Card`` has one registered dependency and four that aren't: a plain
+dataclass, a ``NamedTuple`` and two functions, which injection calls
+directly. Each is looked up in the registry first, and the miss used to
+be an exception. ``RegisteredCard`` has the same shape with everything
+registered, for comparison.
+
+Run with ``python benchmarks/bench_unregistered_dependencies.py``.
+"""
+from dataclasses import dataclass
+from functools import partial
+from timeit import timeit
+from typing import NamedTuple
+
+from hopscotch import Registry
+
+
+@dataclass()
+class Site:
+    """A registered dependency."""
+
+    title: str = "My Site"
+
+
+@dataclass()
+class Icon:
+    """An unregistered dataclass dependency."""
+
+    name: str = "star"
+
+
+class Link(NamedTuple):
+    """An unregistered ``NamedTuple`` dependency."""
+
+    href: str = "/"
+
+
+def footer() -> str:
+    """An unregistered function dependency."""
+    return "Footer"
+
+
+def sidebar() -> str:
+    """Another unregistered function dependency."""
+    return "Sidebar"
+
+
+@dataclass()
+class Card:
+    """A component with one registered and four unregistered dependencies."""
+
+    site: Site
+    icon: Icon
+    link: Link
+    footer: footer  # type: ignore
+    sidebar: sidebar  # type: ignore
+
+
+@dataclass()
+class RegisteredCard:
+    """The same component with only registered dependencies."""
+
+    site: Site
+    icon: Icon
+    link: Link
+    footer: Site
+    sidebar: Site
+
+
+def main() -> None:
+    """Print the per-construction cost of each card."""
+    registry = Registry()
+    registry.register(Site)
+    registry.register(Card)
+
+    registered = Registry()
+    registered.register(Site)
+    registered.register(Icon)
+    registered.register(Link, kind=Link)
+    registered.register(RegisteredCard)
+
+    number = 50_000
+    for title, target, this_registry in (
+        ("4 of 5 unregistered", Card, registry),
+        ("all registered", RegisteredCard, registered),
+    ):
+        get = partial(this_registry.get, target)
+        elapsed = timeit(get, number=number)
+        print(f"{title:>20}: {elapsed / number * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Hopscotch."""
 from __future__ import annotations
 
+from hopscotch.registry import ainject_callable
 from hopscotch.registry import inject_callable
 from hopscotch.registry import injectable
 from hopscotch.registry import Registration
@@ -10,5 +11,6 @@ __all__ = [
     "Registry",
     "injectable",
     "inject_callable",
+    "ainject_callable",
     "Registration",
 ]
@@ -38,3 +38,10 @@ def caller_package(
     # Go up one level to get package
     package_name = module.__name__.rsplit(".", 1)[0]
     return sys.modules[package_name]
+
+
+def caller_location(level: int = 2) -> str:
+    """Return the ``file:line`` of the caller of the current scope."""
+    getframe = getattr(sys, "_getframe")
+    frame = getframe(level)
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
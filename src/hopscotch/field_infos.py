@@ -21,9 +21,11 @@ from typing import Tuple
 from typing import Type
 from typing import TYPE_CHECKING
 from typing import Union
+from weakref import WeakKeyDictionary
 
 if TYPE_CHECKING:
     from hopscotch.operators import Operator
+    from hopscotch.persistence import FieldInfosStore
 
 EMPTY = getattr(inspect, "_empty")
 
@@ -191,9 +193,92 @@ def get_non_dataclass_field_infos(target: Callable[..., Any]) -> list[FieldInfo]
     return field_infos
 
 
-def get_field_infos(target: Any) -> FieldInfos:
-    """Return field info for all the fields on a target."""
+class CacheInfo(NamedTuple):
+    """Statistics about a cache: hits, misses, and current size."""
+
+    hits: int
+    misses: int
+    size: int
+
+
+class FieldInfosCache:
+    """Remember the field infos of targets, for as long as they live.
+
+    Introspection only depends on the target, so the same class in many
+    registries -- or re-registered by repeated scans -- is only
+    introspected once per process. Targets are held weakly.
+
+    With a ``store``, misses are looked up on disk before introspecting,
+    and new introspection results are saved there.
+    """
+
+    store: Optional[FieldInfosStore]
+
+    def __init__(self) -> None:
+        """Start with an empty cache."""
+        self._field_infos: WeakKeyDictionary[Any, FieldInfos] = WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.store = None
+
+    def get(self, target: Any) -> FieldInfos:
+        """Return the cached field infos of a target, introspecting if needed."""
+        try:
+            field_infos = self._field_infos.get(target)
+        except TypeError:
+            # Not hashable or can't be weakly referenced, so no caching.
+            self.misses += 1
+            return introspect_field_infos(target)
+        if field_infos is not None:
+            self.hits += 1
+            return field_infos
+
+        self.misses += 1
+        store = self.store
+        field_infos = store.get(target) if store is not None else None
+        if field_infos is None:
+            field_infos = introspect_field_infos(target)
+            if store is not None:
+                store.set(target, field_infos)
+        try:
+            self._field_infos[target] = field_infos
+        except TypeError:
+            pass
+        return field_infos
+
+    def invalidate(self, target: Any) -> None:
+        """Forget a target, e.g. after its annotations changed."""
+        try:
+            self._field_infos.pop(target, None)
+        except TypeError:
+            pass
+
+    def clear(self) -> None:
+        """Forget all targets and reset the statistics."""
+        self._field_infos = WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Report hits, misses, and size."""
+        return CacheInfo(self.hits, self.misses, len(self._field_infos))
+
+
+field_infos_cache = FieldInfosCache()
+
+
+def introspect_field_infos(target: Any) -> FieldInfos:
+    """Sniff at the target for the field info of all its fields."""
     if is_dataclass(target):
         return get_dataclass_field_infos(target)
     else:
         return get_non_dataclass_field_infos(target)
+
+
+def get_field_infos(target: Any) -> FieldInfos:
+    """Return field info for all the fields on a target.
+
+    Results are shared process-wide through ``field_infos_cache``, so
+    treat the returned list as read-only.
+    """
+    return field_infos_cache.get(target)
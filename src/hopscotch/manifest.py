@@ -0,0 +1,42 @@
+"""Write a registration manifest of a package, e.g. as a build step.
+
+Run ``python -m hopscotch.manifest mypackage manifest.json`` to scan
+``mypackage`` once and write what it registers. At startup, pass the
+file to ``Registry.load_manifest`` instead of scanning.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+from .persistence import write_manifest
+from .registry import PACKAGE
+from .registry import Registry
+
+
+def scan_to_manifest(pkg: PACKAGE, path: Union[str, Path]) -> int:
+    """Scan a package and write its manifest, returning the entry count."""
+    # Lazy, as introspecting is for the processes loading the manifest.
+    registry = Registry(lazy_introspection=True)
+    registry.scan(pkg)
+    entries = registry.make_manifest()
+    write_manifest(entries, path)
+    return len(entries)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Scan the package named on the command line into a manifest file."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2:
+        print("Usage: python -m hopscotch.manifest PACKAGE PATH", file=sys.stderr)
+        return 2
+    package, path = args
+    count = scan_to_manifest(package, path)
+    print(f"Wrote {count} registrations to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Remember constructed immutable components by their inputs.
+
+An immutable component -- a frozen dataclass or a ``NamedTuple`` --
+constructed from the same inputs is the same value. When a registration
+opts in, the instance is remembered, keyed by the arguments it was
+constructed with, so rendering e.g. the same sidebar for thousands of
+pages reuses one object.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from threading import Lock
+from typing import Any
+from typing import Hashable
+from typing import Optional
+
+from .field_infos import CacheInfo
+
+# Used when ``memoize=True`` doesn't say how many instances to keep.
+MEMO_MAXSIZE = 256
+
+MemoKey = tuple[tuple[str, Hashable], ...]
+
+
+def is_immutable_target(target: Any) -> bool:
+    """Is the target a frozen dataclass or a ``NamedTuple``?"""
+    if is_dataclass(target) and isinstance(target, type):
+        return bool(target.__dataclass_params__.frozen)  # type: ignore
+    return (
+        isinstance(target, type)
+        and issubclass(target, tuple)
+        and hasattr(target, "_fields")
+    )
+
+
+class Identity:
+    """Stand in for an unhashable value, by identity, in a memo key.
+
+    Holds on to the value, so its id can't be reused while the key lives.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        """Wrap the value."""
+        self.value = value
+
+    def __hash__(self) -> int:
+        """Hash by the identity of the value."""
+        return id(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        """Equal only when wrapping the very same value."""
+        return isinstance(other, Identity) and other.value is self.value
+
+
+def make_memo_key(kwargs: dict[str, Any]) -> MemoKey:
+    """Turn construction arguments into a hashable key.
+
+    Hashable values, such as strings or other immutable components, are
+    used by type and value, as equal values of different types, such as
+    ``1``, ``1.0`` and ``True``, construct different instances. Anything
+    else is used by identity.
+    """
+    items: list[tuple[str, Hashable]] = []
+    for name, value in kwargs.items():
+        try:
+            hash(value)
+        except TypeError:
+            items.append((name, Identity(value)))
+        else:
+            items.append((name, (type(value), value)))
+    return tuple(items)
+
+
+class Memo:
+    """A size-bounded, least-recently-used map of key to instance."""
+
+    def __init__(self, maxsize: int = MEMO_MAXSIZE) -> None:
+        """Start empty, keeping at most ``maxsize`` instances."""
+        self.maxsize = maxsize
+        self._instances: OrderedDict[MemoKey, Any] = OrderedDict()
+        # Reordering on reads isn't atomic, so threads take turns.
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: MemoKey) -> Optional[Any]:
+        """Return the remembered instance, if any, as most recently used."""
+        with self._lock:
+            try:
+                instance = self._instances[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._instances.move_to_end(key)
+            self.hits += 1
+            return instance
+
+    def set(self, key: MemoKey, instance: Any) -> Optional[MemoKey]:
+        """Remember an instance, returning the key evicted to make room."""
+        with self._lock:
+            self._instances[key] = instance
+            self._instances.move_to_end(key)
+            if len(self._instances) > self.maxsize:
+                evicted_key, _ = self._instances.popitem(last=False)
+                return evicted_key
+            return None
+
+    def discard(self, key: MemoKey) -> None:
+        """Forget one instance, if remembered."""
+        with self._lock:
+            self._instances.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all instances."""
+        with self._lock:
+            self._instances.clear()
+
+    def info(self) -> CacheInfo:
+        """Report hits, misses, and size."""
+        return CacheInfo(self.hits, self.misses, len(self._instances))
@@ -0,0 +1,211 @@
+"""Remember introspection and scanning results on disk between runs.
+
+Restarting a worker or rebuilding a static site shouldn't have to run
+``get_type_hints`` again on components that haven't changed. A
+``FieldInfosStore`` keeps field infos in a file, keyed by the target's
+dotted name, and fingerprints the files (modification time and size) of
+the modules the target and its base classes are defined in, to notice
+when they are stale.
+
+Nor should it have to import a whole package to find its decorators. A
+manifest lists what a scan registered, by dotted name, for a registry
+to load without importing the implementations until they are used.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pickle  # noqa: S403
+import sys
+from importlib import import_module
+from inspect import getmro
+from inspect import isclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+from typing import Optional
+from typing import Type
+from typing import TypedDict
+from typing import Union
+
+from .field_infos import field_infos_cache
+from .field_infos import FieldInfos
+
+# A module file's (mtime in nanoseconds, size)
+Fingerprint = tuple[int, int]
+# The fingerprints of a target's module and its bases' modules.
+Fingerprints = tuple[Optional[Fingerprint], ...]
+
+
+def get_module_fingerprint(module_name: str) -> Optional[Fingerprint]:
+    """Fingerprint the file of an imported module, if it has one."""
+    module = sys.modules.get(module_name)
+    module_file = getattr(module, "__file__", None)
+    if module_file is None:
+        return None
+    try:
+        stat = os.stat(module_file)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_target_key(target: Any) -> Optional[str]:
+    """Return the dotted name to store a target under, if it has one."""
+    module_name = getattr(target, "__module__", None)
+    qualname = getattr(target, "__qualname__", None)
+    if module_name is None or qualname is None or "<locals>" in qualname:
+        # Can't be found again by name in another process.
+        return None
+    return f"{module_name}:{qualname}"
+
+
+def import_target(target_key: str) -> Any:
+    """Import what a ``module:qualname`` dotted name points to."""
+    module_name, _, qualname = target_key.partition(":")
+    target: Any = import_module(module_name)
+    for name in qualname.split(".") if qualname else ():
+        target = getattr(target, name)
+    return target
+
+
+class ManifestEntry(TypedDict):
+    """One registration in a manifest, with targets as dotted names."""
+
+    kind: str
+    context: Optional[str]
+    implementation: str
+    is_singleton: bool
+    lifetime: str
+    memoize: Union[bool, int]
+    decorator: Optional[str]
+
+
+def read_manifest(path: Union[str, Path]) -> list[ManifestEntry]:
+    """Read the entries of a manifest, in registration order."""
+    with Path(path).open() as f:
+        entries: list[ManifestEntry] = json.load(f)
+    return entries
+
+
+def write_manifest(entries: list[ManifestEntry], path: Union[str, Path]) -> None:
+    """Write the entries of a manifest, replacing the file in one step."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w") as f:
+        json.dump(entries, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+class FieldInfosStore:
+    """A file of field infos, loaded on first use and written on ``save``.
+
+    Each entry is pickled separately, so loading the store doesn't
+    import the modules of targets this process never asks about.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Point the store at a file, which need not exist yet."""
+        self.path = Path(path)
+        self._entries: Optional[dict[str, tuple[Fingerprints, bytes]]] = None
+        self._fingerprints: dict[str, Optional[Fingerprint]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def entries(self) -> dict[str, tuple[Fingerprints, bytes]]:
+        """The stored entries, read from the file on first access."""
+        if self._entries is None:
+            try:
+                with self.path.open("rb") as f:
+                    self._entries = pickle.load(f)  # noqa: S301
+            except (OSError, EOFError, pickle.UnpicklingError):
+                self._entries = {}
+        return self._entries
+
+    def _fingerprint(self, module_name: str) -> Optional[Fingerprint]:
+        """Fingerprint a module once per process."""
+        try:
+            return self._fingerprints[module_name]
+        except KeyError:
+            fingerprint = get_module_fingerprint(module_name)
+            self._fingerprints[module_name] = fingerprint
+            return fingerprint
+
+    def _target_fingerprints(self, target: Any) -> Optional[Fingerprints]:
+        """Fingerprint the modules of a target and its base classes.
+
+        Fields can be inherited from a base in another module, so a
+        change there makes the target's field infos stale too.
+        """
+        bases = getmro(target) if isclass(target) else ()
+        module_names = dict.fromkeys(
+            [target.__module__, *(base.__module__ for base in bases)]
+        )
+        module_names.pop("builtins", None)
+        fingerprints = tuple(self._fingerprint(name) for name in module_names)
+        if not fingerprints or fingerprints[0] is None:
+            # The target's own module has no file to notice changes in.
+            return None
+        return fingerprints
+
+    def get(self, target: Any) -> Optional[FieldInfos]:
+        """Return stored field infos, unless missing or stale."""
+        key = get_target_key(target)
+        entry = self.entries.get(key) if key is not None else None
+        if entry is not None:
+            fingerprints, data = entry
+            if fingerprints == self._target_fingerprints(target):
+                try:
+                    field_infos: FieldInfos = pickle.loads(data)  # noqa: S301
+                except Exception:  # noqa: S110
+                    # E.g. a type that moved, so introspect instead.
+                    pass
+                else:
+                    self.hits += 1
+                    return field_infos
+        self.misses += 1
+        return None
+
+    def set(self, target: Any, field_infos: FieldInfos) -> None:
+        """Remember the field infos of a target, if they can be stored."""
+        key = get_target_key(target)
+        if key is None:
+            return
+        fingerprints = self._target_fingerprints(target)
+        if fingerprints is None:
+            return
+        try:
+            data = pickle.dumps(field_infos)
+        except Exception:
+            # E.g. a default value that can't be pickled.
+            return
+        self.entries[key] = (fingerprints, data)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the entries to the file, if anything changed."""
+        if not self._dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(self.entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def __enter__(self) -> FieldInfosStore:
+        """Use the store for the process-wide field infos cache."""
+        field_infos_cache.store = self
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop using the store and write any new entries."""
+        if field_infos_cache.store is self:
+            field_infos_cache.store = None
+        self.save()
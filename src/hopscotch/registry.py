@@ -1,33 +1,92 @@
 """Type-oriented registry that start simple and finishes powerful."""
 from __future__ import annotations
 
+from abc import ABCMeta
+from asyncio import gather
 from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from dataclasses import field
+from functools import cached_property
+from functools import lru_cache
+from functools import partial
 from importlib import import_module
+from importlib import invalidate_caches
 from inspect import getmro
+from inspect import isawaitable
 from inspect import isclass
+from pathlib import Path
+from sys import modules
+from threading import local
+from threading import Lock
+from threading import RLock
+from time import perf_counter
+from types import MappingProxyType
 from types import ModuleType
 from typing import Any
+from typing import Awaitable
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import cast
+from typing import Literal
+from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
 from typing import Type
 from typing import TypedDict
 from typing import TypeVar
 from typing import Union
+from weakref import finalize
+from weakref import ref
+from weakref import ReferenceType
+from weakref import WeakSet
 
 from venusian import attach
 from venusian import Scanner
 
+from .callers import caller_location
 from .callers import caller_package
+from .field_infos import CacheInfo
 from .field_infos import FieldInfo
 from .field_infos import FieldInfos
 from .field_infos import get_field_infos
+from .memo import is_immutable_target
+from .memo import make_memo_key
+from .memo import Memo
+from .memo import MEMO_MAXSIZE
+from .operators import Get
+from .persistence import get_target_key
+from .persistence import import_target
+from .persistence import ManifestEntry
+from .persistence import read_manifest
+from .scanning import attach_submodules
+from .scanning import find_importers
+from .scanning import fingerprint
+from .scanning import get_module_file
+from .scanning import is_unchanged
+from .scanning import iter_module_names
+from .scanning import ModuleFingerprint
+from .scanning import ModuleScan
+from .tracking import DependencyTracker
+from .tracking import record
+from .tracking import recording
+from .tracking import registration_dependency
 
 PACKAGE = Optional[Union[ModuleType, str]]
 Props = dict[str, Any]
 
+# Serializes lazy introspection when registrations are shared by threads.
+_introspection_lock = Lock()
+
+# Serializes writers to registries; readers never take it.
+_write_lock = RLock()
+
+# How long a constructed instance is reused: not at all, for the life of
+# the registry it was asked from, or for the life of the root registry.
+Lifetime = Literal["transient", "registry", "root"]
+LIFETIMES: tuple[Lifetime, ...] = ("transient", "registry", "root")
+
 
 class IsNoneType:
     """Mimic Python 3.10 ``NoneType`` as just a marker."""
@@ -35,6 +94,45 @@ class IsNoneType:
     pass
 
 
+class Provenance(NamedTuple):
+    """Where a registration came from.
+
+    The target's module and qualname, and the decorator that registered
+    it, identify the registration: another one with the same provenance
+    in the same place is a duplicate. The ``location`` is a ``file:line``
+    or manifest, for error messages.
+    """
+
+    module: str
+    qualname: str
+    decorator: Optional[str] = None
+    location: Optional[str] = None
+
+    @property
+    def key(self) -> tuple[str, str, Optional[str]]:
+        """What makes two registrations duplicates."""
+        return self.module, self.qualname, self.decorator
+
+    def __str__(self) -> str:
+        """Say where the registration came from, shortly."""
+        if self.decorator is not None:
+            where = f"@{self.decorator} on {self.module}:{self.qualname}"
+            return where if self.location is None else f"{where} at {self.location}"
+        elif self.location is not None:
+            return self.location
+        return f"{self.module}:{self.qualname}"
+
+
+def make_provenance(
+    import_path: str,
+    decorator: Optional[str] = None,
+    location: Optional[str] = None,
+) -> Provenance:
+    """Make the provenance of a registration of a ``module:qualname``."""
+    module, _, qualname = import_path.partition(":")
+    return Provenance(module, qualname, decorator, location)
+
+
 @dataclass()
 class Registration:
     """Collect registration and introspection info of a target."""
@@ -43,18 +141,129 @@ class Registration:
     implementation: Union[Callable[..., object], object]
     kind: Optional[Callable[..., object]] = None
     context: Optional[Callable[..., object]] = None
-    field_infos: FieldInfos = field(default_factory=list)
     is_singleton: bool = False
+    lazy: bool = False
+    lifetime: Lifetime = "transient"
+    memoize: Union[bool, int] = False
+    import_path: Optional[str] = None
+    provenance: Optional[Provenance] = field(default=None, compare=False)
+    is_loaded: bool = field(default=True, init=False, repr=False, compare=False)
+    _load_lock: Lock = field(
+        default_factory=Lock, init=False, repr=False, compare=False
+    )
+    _field_infos: Optional[FieldInfos] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _plan: Optional[InjectionPlan] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    memo: Optional[Memo] = field(default=None, init=False, repr=False, compare=False)
+    # The registry holding it, which keeps its ``root`` lifetime instance.
+    holder: Optional[ReferenceType[Registry]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
-        """Extract and assign the field infos if not singleton."""
-        if not self.is_singleton:
-            self.field_infos = get_field_infos(self.implementation)
+        """Extract and assign the field infos if not singleton or lazy."""
+        if self.import_path is not None and self.implementation is None:
+            # Imported when first used, see ``load``.
+            self.is_loaded = False
+            return
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Set up what the implementation needs to be injected."""
+        if self.is_singleton:
+            self._field_infos = []
+            return
+        elif not self.lazy:
+            self._field_infos = get_field_infos(self.implementation)
+
+        if self.memoize is not False:
+            if not is_immutable_target(self.implementation):
+                ql = self.implementation.__qualname__  # type: ignore
+                msg = f"Cannot memoize {ql!r}, not a frozen dataclass or NamedTuple"
+                raise ValueError(msg)
+            maxsize = MEMO_MAXSIZE if self.memoize is True else int(self.memoize)
+            self.memo = Memo(maxsize)
+
+    def load(self) -> None:
+        """Import the implementation of a registration by dotted name.
+
+        The ``import_path`` is a ``module:qualname`` name. A singleton
+        that names a class gets an instance of it, as its decorator did.
+        Import errors say where the registration came from, as it may be
+        far from where it is first used.
+        """
+        if self.is_loaded:
+            return
+        # Import without holding a lock, as the module may itself look
+        # up, and so load, other registrations while it is imported.
+        import_path = cast(str, self.import_path)
+        try:
+            target = import_target(import_path)
+        except (ImportError, AttributeError) as exc:
+            msg = f"Cannot import {import_path!r}{self._from()}: {exc}"
+            raise ImportError(msg, name=import_path) from exc
+        if not (self.is_singleton or isclass(target)):
+            msg = f"{import_path!r}{self._from()} is not a class"
+            raise TypeError(msg)
+        with self._load_lock:
+            if self.is_loaded:
+                return
+            if self.is_singleton and isclass(target):
+                target = target()
+            self.implementation = target
+            self._prepare()
+            self.is_loaded = True
+
+    def _from(self) -> str:
+        """Say where the registration came from, for error messages."""
+        return "" if self.provenance is None else f" (from {self.provenance})"
+
+    @property
+    def field_infos(self) -> FieldInfos:
+        """The introspected fields, computed on first use if lazy."""
+        field_infos = self._field_infos
+        if field_infos is None:
+            with _introspection_lock:
+                field_infos = self._field_infos
+                if field_infos is None:
+                    field_infos = get_field_infos(self.implementation)
+                    self._field_infos = field_infos
+        return field_infos
+
+    @field_infos.setter
+    def field_infos(self, field_infos: FieldInfos) -> None:
+        self._field_infos = field_infos
+        self._plan = None
+
+    @property
+    def plan(self) -> InjectionPlan:
+        """The injection plan, compiled on first use."""
+        plan = self._plan
+        if plan is None:
+            plan = self._plan = make_injection_plan(self)
+        return plan
 
 
 T = TypeVar("T")
 
 
+@lru_cache(maxsize=1024)
+def get_unregistered_registration(ft: type) -> Registration:
+    """Make a registration, shared by all callers, for an unregistered type.
+
+    It doesn't depend on any registry, so its field infos and injection
+    plan are reused wherever the type is injected without a registration.
+    """
+    return Registration(
+        context=None,
+        implementation=ft,
+        is_singleton=False,  # TODO They might be in registry
+    )
+
+
 def inject_field_no_registry(
     field_info: FieldInfo,
     props: Optional[Props],
@@ -67,143 +276,964 @@ def inject_field_no_registry(
         # user-defined classes
         # Treat this as a symbol that can be injected without
         # a lookup, such as a function, NamedTuple, etc.
-        # TODO Would be great to avoid computing this each time
-        registration = Registration(
-            context=None,
-            implementation=ft,
-            is_singleton=False,  # TODO They might be in registry
-        )
+        registration = get_unregistered_registration(ft)
         return inject_callable(registration, props=props)
 
     return None
 
 
-def inject_field_registry(
+async def ainject_field_no_registry(
     field_info: FieldInfo,
-    registry: Registry,
-) -> Optional[Any]:
-    """Get a value for a field using a registry."""
+    props: Optional[Props],
+) -> Optional[object]:
+    """Get a value for a field without a registry, awaiting factories."""
+    ft = field_info.field_type
+    if not (ft is None or field_info.is_builtin):
+        registration = get_unregistered_registration(ft)
+        value: object = await ainject_callable(registration, props=props)
+        return value
+
+    return None
+
+
+FieldResolver = Callable[[Optional[Props], Optional["Registry"]], object]
+AsyncFieldResolver = Callable[
+    [Optional[Props], Optional["Registry"]], Awaitable[object]
+]
+
+
+def make_missing_value(
+    field_info: FieldInfo,
+    target: object,
+) -> Callable[[], object]:
+    """Compile what to do when injection found no value for a field."""
+    default_value = field_info.default_value
+    default_factory = field_info.default_factory
+    if default_value is not None:
+        return lambda: default_value
+    elif default_factory is not None:
+        return default_factory
+
+    def missing() -> object:
+        # We failed injection.
+        ql = target.__qualname__  # type: ignore
+        fn = field_info.field_name
+        ft = field_info.field_type
+        ft_name = "None" if ft is None else ft.__name__
+        msg = f"Cannot inject {ft_name!r} on '{ql}.{fn}'"
+        raise ValueError(msg)
+
+    return missing
+
+
+def make_field_lookup(
+    field_info: FieldInfo,
+) -> Optional[Callable[[Registry], object]]:
+    """Compile how a field gets its value from a registry, if it can."""
     ft = field_info.field_type
-    is_builtin = field_info.is_builtin
     operator = field_info.operator
     if operator is not None:
         # This field uses Annotated[SomeType, SomeOperator]
-        return operator(registry)
+        def lookup_operator(registry: Registry) -> object:
+            if registry.tracker is not None:
+                record(operator)
+            return operator(registry)
+
+        return lookup_operator
     elif ft is Registry:
         # Special rule: if you ask for the registry, you'll get it
-        return registry
-    elif not (ft is None or is_builtin):
-        # Avoid trying to inject str, meaning, only inject
-        # user-defined classes
-        # TODO If ``ft`` is a function or NamedTuple, it kind of breaks
-        #   the type-oriented contract for ``get``. But the following
-        #   might still work.  Not sure the right solution.
-        try:
-            return registry.get(ft)
-        except LookupError as exc:
-            # See if this dependency is in parent registries
-            if registry.parent:
-                return registry.parent.get(ft)
-            # No parent registry, just re-raise the exception
-            raise exc
+        def lookup_registry(registry: Registry) -> object:
+            return registry
+
+        return lookup_registry
+    elif not (ft is None or field_info.is_builtin):
+        # Only inject user-defined classes, not e.g. str.
+        def lookup(registry: Registry) -> object:
+            return registry.find(ft)
 
+        return lookup
     return None
 
 
-def inject_callable(
-    registration: Registration,
-    props: Optional[Props] = None,
-    registry: Optional[Registry] = None,
-) -> T:
-    """Construct target with or without a registry."""
-    target = registration.implementation
-    kwargs = {}
+def make_field_resolver(field_info: FieldInfo, target: object) -> FieldResolver:
+    """Compile the injection rules for one field into a single callable.
 
-    # If the target has a ``__hopscotch_factory__``, use that instead
-    # of automated construction.
-    factory = getattr(target, "__hopscotch_factory__", None)
+    The decisions about operators, the registry, and builtins are made
+    once here, rather than on each injection.
+    """
+    fn = field_info.field_name
+    missing = make_missing_value(field_info, target)
+    lookup = make_field_lookup(field_info)
 
-    if factory is not None and registry is not None:
-        result: T = factory(registry)
-        return result
+    if lookup is None:
+        # Nothing to inject, only props or the default can provide a value.
+        def resolve_builtin(
+            props: Optional[Props],
+            registry: Optional[Registry],
+        ) -> object:
+            value = props.get(fn) if props else None
+            return missing() if value is None else value
 
-    for field_info in registration.field_infos:
-        fn = field_info.field_name
+        return resolve_builtin
+
+    def resolve(props: Optional[Props], registry: Optional[Registry]) -> object:
         if props and fn in props:
             # Props have highest precedence
-            field_value = props[fn]
-        elif registry:
+            value = props[fn]
+        elif registry is not None:
             try:
-                field_value = inject_field_registry(field_info, registry)
+                value = lookup(registry)
             except LookupError:
+                # An operator, e.g. ``Get``, didn't find its kind.
+                value = NOT_FOUND
+            if value is NOT_FOUND:
                 # During *injection* (not during ``registry.get``) we
                 # allow injectable dependencies that aren't registered.
                 # Maybe a function, dataclass, whatever. Just inject it.
-                field_value = inject_field_no_registry(field_info, props)
+                value = inject_field_no_registry(field_info, props)
         else:
-            field_value = inject_field_no_registry(field_info, props)
-
-        # If we didn't get a value...
-        if field_value is None:
-            if field_info.default_value is not None:
-                # ...try to get from default
-                field_value = field_info.default_value
-            elif field_info.default_factory is not None:
-                field_value = field_info.default_factory()
-            else:
-                # ...otherwise, we failed injection.
-                ql = target.__qualname__  # type: ignore
-                ft = field_info.field_type
-                ft_name = "None" if ft is None else ft.__name__
-                msg = f"Cannot inject {ft_name!r} on '{ql}.{fn}'"
-                raise ValueError(msg)
+            value = inject_field_no_registry(field_info, props)
+        return missing() if value is None else value
+
+    return resolve
+
+
+def make_async_get_lookup(operator: Get) -> Callable[[Registry], Awaitable[object]]:
+    """Compile a ``Get`` operator to look its kind up with ``aget``.
+
+    Calling ``Get`` uses ``registry.get``, which would leave the kind's
+    async factories unawaited.
+    """
+
+    async def lookup_get(registry: Registry) -> object:
+        if registry.tracker is not None:
+            record(operator)
+        if isinstance(operator.lookup_key, str):
+            # Let the operator raise its error.
+            return operator(registry)
+        value = await registry.aget(operator.lookup_key)
+        attr = operator.attr
+        return value if attr is None else getattr(value, attr)
+
+    return lookup_get
+
 
-        kwargs[fn] = field_value
+def make_async_field_lookup(
+    field_info: FieldInfo,
+) -> Optional[Callable[[Registry], Awaitable[object]]]:
+    """Compile how a field gets its value from a registry, awaiting it."""
+    ft = field_info.field_type
+    operator = field_info.operator
+    if isinstance(operator, Get):
+        return make_async_get_lookup(operator)
+    elif operator is not None:
+        # Operators may be async, or return something awaitable.
+        async def lookup_operator(registry: Registry) -> object:
+            if registry.tracker is not None:
+                record(operator)
+            value: Any = operator(registry)
+            if isawaitable(value):
+                value = await value
+            return value
+
+        return lookup_operator
+    elif ft is Registry:
+
+        async def lookup_registry(registry: Registry) -> object:
+            return registry
+
+        return lookup_registry
+    elif not (ft is None or field_info.is_builtin):
+
+        async def lookup(registry: Registry) -> object:
+            return await registry.afind(ft)
+
+        return lookup
+    return None
+
+
+def make_async_field_resolver(
+    field_info: FieldInfo, target: object
+) -> AsyncFieldResolver:
+    """Compile the injection rules for one field, for ``ainject_callable``."""
+    fn = field_info.field_name
+    missing = make_missing_value(field_info, target)
+    lookup = make_async_field_lookup(field_info)
+
+    async def resolve(props: Optional[Props], registry: Optional[Registry]) -> object:
+        if props and fn in props:
+            value = props[fn]
+        elif lookup is None:
+            value = None
+        elif registry is not None:
+            try:
+                value = await lookup(registry)
+            except LookupError:
+                value = NOT_FOUND
+            if value is NOT_FOUND:
+                value = await ainject_field_no_registry(field_info, props)
+        else:
+            value = await ainject_field_no_registry(field_info, props)
+        return missing() if value is None else value
+
+    return resolve
+
+
+@dataclass(frozen=True)
+class InjectionPlan:
+    """The precomputed work to construct a registration's target."""
+
+    factory: Optional[Callable[[Registry], object]]
+    field_resolvers: tuple[tuple[str, FieldResolver], ...]
+    async_field_resolvers: tuple[AsyncFieldResolver, ...]
+
+
+def make_injection_plan(registration: Registration) -> InjectionPlan:
+    """Compile a registration's field infos into an injection plan."""
+    target = registration.implementation
+    field_resolvers = tuple(
+        (field_info.field_name, make_field_resolver(field_info, target))
+        for field_info in registration.field_infos
+    )
+    async_field_resolvers = tuple(
+        make_async_field_resolver(field_info, target)
+        for field_info in registration.field_infos
+    )
+    return InjectionPlan(
+        factory=getattr(target, "__hopscotch_factory__", None),
+        field_resolvers=field_resolvers,
+        async_field_resolvers=async_field_resolvers,
+    )
+
+
+def inject_callable(
+    registration: Registration,
+    props: Optional[Props] = None,
+    registry: Optional[Registry] = None,
+) -> T:
+    """Construct target with or without a registry."""
+    plan = registration.plan
+
+    # If the target has a ``__hopscotch_factory__``, use that instead
+    # of automated construction.
+    if plan.factory is not None and registry is not None:
+        result: T = plan.factory(registry)  # type: ignore
+        return result
+
+    if registry is not None and registry.tracker is not None:
+        return inject_tracked(  # type: ignore
+            registration, props, registry, registry.tracker
+        )
+
+    kwargs = {
+        field_name: resolve(props, registry)
+        for field_name, resolve in plan.field_resolvers
+    }
+    return construct(registration, kwargs)  # type: ignore
+
+
+def construct(registration: Registration, kwargs: Props) -> Any:
+    """Call the target with its injected arguments."""
+    memo = registration.memo
+    if memo is not None:
+        # Immutable, so the same inputs can reuse the same instance.
+        key = make_memo_key(kwargs)
+        instance = memo.get(key)
+        if instance is None:
+            instance = registration.implementation(**kwargs)  # type: ignore
+            memo.set(key, instance)
+        return instance
 
     # Construct and return the class
-    return target(**kwargs)  # type: ignore
+    return registration.implementation(**kwargs)  # type: ignore
+
+
+def inject_tracked(
+    registration: Registration,
+    props: Optional[Props],
+    registry: Registry,
+    tracker: DependencyTracker,
+) -> Any:
+    """Construct while recording what was read, to track memoized results."""
+    with recording() as reads:
+        kwargs = {
+            field_name: resolve(props, registry)
+            for field_name, resolve in registration.plan.field_resolvers
+        }
+    return construct_tracked(registration, kwargs, reads, tracker)
+
+
+def construct_tracked(
+    registration: Registration,
+    kwargs: Props,
+    reads: set[Any],
+    tracker: DependencyTracker,
+) -> Any:
+    """Call the target, tracking what a memoized instance was built from."""
+    memo = registration.memo
+    if memo is None:
+        return registration.implementation(**kwargs)  # type: ignore
+
+    key = make_memo_key(kwargs)
+    instance = memo.get(key)
+    if instance is None:
+        instance = registration.implementation(**kwargs)  # type: ignore
+        evicted_key = memo.set(key, instance)
+        if evicted_key is not None:
+            tracker.discard(id(memo), evicted_key)
+        tracker.add(
+            id(memo), key, instance, registration, reads, partial(memo.discard, key)
+        )
+    return instance
+
+
+async def ainject_callable(
+    registration: Registration,
+    props: Optional[Props] = None,
+    registry: Optional[Registry] = None,
+) -> Any:
+    """Construct target, awaiting async factories and operators.
+
+    The fields are resolved concurrently, so a target waits for its
+    slowest dependency rather than the sum of them.
+    """
+    plan = registration.plan
+
+    if plan.factory is not None and registry is not None:
+        result: Any = plan.factory(registry)
+        if isawaitable(result):
+            result = await result
+        return result
+
+    field_names = [field_name for field_name, _ in plan.field_resolvers]
+    tracker = registry.tracker if registry is not None else None
+    if tracker is None:
+        values = await gather(
+            *[resolve(props, registry) for resolve in plan.async_field_resolvers]
+        )
+        return construct(registration, dict(zip(field_names, values, strict=True)))
+
+    with recording() as reads:
+        values = await gather(
+            *[resolve(props, registry) for resolve in plan.async_field_resolvers]
+        )
+    kwargs = dict(zip(field_names, values, strict=True))
+    return construct_tracked(registration, kwargs, reads, tracker)
+
+
+class Candidates:
+    """The registrations of a kind for a context, newest first.
+
+    Only the newest is ever chosen, but all of them can be listed. An
+    immutable linked list: a registration is added in front by making a
+    new head that shares the rest, which takes the same time however
+    many came before, and leaves the old head as it was for readers.
+    """
+
+    __slots__ = ("newest", "older")
+
+    def __init__(self, newest: Registration, older: Optional[Candidates] = None):
+        """Put a registration in front of the older ones."""
+        self.newest = newest
+        self.older = older
+
+    def __iter__(self) -> Iterator[Registration]:
+        """Go from the newest registration to the oldest."""
+        candidates: Optional[Candidates] = self
+        while candidates is not None:
+            yield candidates.newest
+            candidates = candidates.older
+
+    def __reversed__(self) -> Iterator[Registration]:
+        """Go from the oldest registration to the newest."""
+        return reversed(tuple(self))
+
+    def __len__(self) -> int:
+        """Count the registrations, walking them."""
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        """There is always at least the newest registration."""
+        return True
+
+    def __getitem__(self, index: int) -> Registration:
+        """Get a registration by position, the newest at 0."""
+        if index == 0:
+            return self.newest
+        return tuple(self)[index]
+
+    def __repr__(self) -> str:
+        """Show the registrations, newest first."""
+        return f"Candidates({list(self)!r})"
+
+
+def make_candidates(registrations: Iterable[Registration]) -> Optional[Candidates]:
+    """Link registrations, given newest first, if there are any."""
+    candidates = None
+    for registration in reversed(tuple(registrations)):
+        candidates = Candidates(registration, candidates)
+    return candidates
 
 
 class KindGroups(TypedDict):
-    """Constrain the keys to just singleton and classes."""
+    """Constrain the keys to just singleton and classes.
 
-    singletons: dict[Union[type, IsNoneType], list[Registration]]
-    classes: dict[Union[type, IsNoneType], list[Registration]]
+    Never changed once in a registry, a new registration replaces it.
+    The ABCs among the contexts are kept aside, as a context class can
+    be a virtual subclass of them, which its MRO doesn't show.
+    """
+
+    singletons: Mapping[Union[type, IsNoneType], Candidates]
+    classes: Mapping[Union[type, IsNoneType], Candidates]
+    abcs: tuple[ABCMeta, ...]
 
 
 def make_singletons_classes() -> KindGroups:
-    """Factory for defaultdict to initialize second level of tree."""
+    """Make the empty second level of the tree."""
     kind_groups: KindGroups = {
-        "singletons": defaultdict(list),
-        "classes": defaultdict(list),
+        "singletons": {},
+        "classes": {},
+        "abcs": (),
     }
     return kind_groups
 
 
+# Where a registration goes in its kind's groups.
+Addition = tuple[
+    Literal["singletons", "classes"], Union[type, IsNoneType], Registration
+]
+
+
+def add_to_kind_groups(
+    kind_groups: KindGroups,
+    additions: Iterable[Addition],
+) -> KindGroups:
+    """Copy the kind groups with registrations, in order, added in front."""
+    added: dict[
+        tuple[Literal["singletons", "classes"], Any], list[Registration]
+    ] = defaultdict(list)
+    for s_or_c, this_context, registration in additions:
+        added[s_or_c, this_context].append(registration)
+
+    new_kind_groups = kind_groups.copy()
+    abcs = list(kind_groups["abcs"])
+    for (s_or_c, this_context), these_registrations in added.items():
+        group = dict(new_kind_groups[s_or_c])
+        candidates: Optional[Candidates] = group.get(this_context)
+        for registration in these_registrations:
+            candidates = group[this_context] = Candidates(registration, candidates)
+        new_kind_groups[s_or_c] = group
+        if isinstance(this_context, ABCMeta) and this_context not in abcs:
+            abcs.append(this_context)
+    new_kind_groups["abcs"] = tuple(abcs)
+    return new_kind_groups
+
+
+def remove_from_kind_groups(
+    kind_groups: KindGroups,
+    removed: set[int],
+) -> KindGroups:
+    """Copy the kind groups without the registrations of the given ids."""
+    new_kind_groups = kind_groups.copy()
+    for s_or_c in ("singletons", "classes"):
+        group: dict[Any, Candidates] = {}
+        these_groups = kind_groups[s_or_c]
+        candidates: Optional[Candidates]
+        for this_context, candidates in these_groups.items():
+            if not any(id(r) in removed for r in candidates):
+                group[this_context] = candidates
+                continue
+            candidates = make_candidates(r for r in candidates if id(r) not in removed)
+            if candidates is not None:
+                group[this_context] = candidates
+        new_kind_groups[s_or_c] = group
+    new_kind_groups["abcs"] = tuple(
+        abc
+        for abc in kind_groups["abcs"]
+        if abc in new_kind_groups["classes"] or abc in new_kind_groups["singletons"]
+    )
+    return new_kind_groups
+
+
+def make_manifest_entry(
+    kind: Any, context: Optional[Any], registration: Registration
+) -> ManifestEntry:
+    """Describe a registration by the dotted names of what it refers to."""
+    implementation = registration.import_path
+    provenance = registration.provenance
+    if registration.is_loaded:
+        target = registration.implementation
+        if registration.is_singleton and get_target_key(target) is None:
+            # An instance, e.g. from a singleton decorator: name its class.
+            target = type(target)
+        implementation = get_target_key(target)
+    names = {
+        "kind": get_target_key(kind),
+        "context": None if context is None else get_target_key(context),
+        "implementation": implementation,
+    }
+    for what, name in names.items():
+        if name is None and not (what == "context" and context is None):
+            msg = f"Cannot put {registration!r} in a manifest, no name for {what}"
+            raise ValueError(msg)
+    return {
+        "kind": cast(str, names["kind"]),
+        "context": names["context"],
+        "implementation": cast(str, implementation),
+        "is_singleton": registration.is_singleton,
+        "lifetime": registration.lifetime,
+        "memoize": registration.memoize,
+        "decorator": provenance.decorator if provenance else None,
+    }
+
+
+# Where a registration with a provenance is: kind, group, context, and
+# the provenance key.
+ProvenanceKey = tuple[Any, str, Any, tuple[str, str, Optional[str]]]
+
+
+def get_provenance_key(st: Any, addition: Addition) -> Optional[ProvenanceKey]:
+    """Where a registration is, if it has a provenance."""
+    s_or_c, this_context, registration = addition
+    provenance = registration.provenance
+    if provenance is None:
+        return None
+    return st, s_or_c, this_context, provenance.key
+
+
+def find_duplicates(
+    provenances: Mapping[ProvenanceKey, Registration],
+    st: Any,
+    additions: list[Addition],
+) -> tuple[set[int], list[Addition]]:
+    """Find what new registrations of a kind replace, by provenance.
+
+    Returns the ids of the registrations in the registry that the
+    additions replace, and the additions without those that a later one
+    of them replaces.
+    """
+    latest: dict[ProvenanceKey, int] = {}
+    for index, addition in enumerate(additions):
+        key = get_provenance_key(st, addition)
+        if key is not None:
+            latest[key] = index
+    if not latest:
+        return set(), additions
+
+    kept = []
+    for index, addition in enumerate(additions):
+        key = get_provenance_key(st, addition)
+        if key is None or latest[key] == index:
+            kept.append(addition)
+    replaced = {id(provenances[key]) for key in latest if key in provenances}
+    return replaced, kept
+
+
+# Kind to kind groups. Keys are only ever added or replaced, one at a time.
 Registrations = dict[type, KindGroups]
 
 
+def get_contexts(
+    context_class: Optional[Any],
+    lineage: Iterable[KindGroups],
+) -> tuple[Any, ...]:
+    """The contexts to look for, most specific first.
+
+    That is the context class MRO, then the registered ABCs the class is
+    a virtual subclass of, by ``ABC.register`` or ``__subclasshook__``,
+    then no context. Only the ABC contexts are checked with
+    ``issubclass``, so the cost doesn't grow with the other contexts.
+    """
+    if context_class is None:
+        return (IsNoneType,)
+    mro = context_class.__mro__
+    virtual = {
+        abc: None
+        for kind_groups in lineage
+        for abc in kind_groups["abcs"]
+        if abc not in mro and issubclass(context_class, abc)
+    }
+    return (*mro, *virtual, IsNoneType)
+
+
+def match_kind_groups(
+    kind_groups: KindGroups,
+    contexts: tuple[Any, ...],
+    allow_singletons: bool,
+) -> Optional[Registration]:
+    """Return the first registration for the contexts, in order."""
+    classes = kind_groups["classes"]
+    singletons = kind_groups["singletons"] if allow_singletons else None
+    for this_context in contexts:
+        # Class registrations override singletons for the same context.
+        these_registrations = classes.get(this_context)
+        if not these_registrations and singletons is not None:
+            these_registrations = singletons.get(this_context)
+        if these_registrations:
+            return these_registrations.newest
+    return None
+
+
+# Key for the resolution cache: (kind, context class, allow_singletons)
+ResolutionKey = tuple[Any, Optional[Any], bool]
+
+# Marker for "not in the resolution cache", as ``None`` is a valid answer.
+_NOT_CACHED = object()
+
+
+def get_field_dependencies(field_infos: FieldInfos) -> Iterator[tuple[Any, bool]]:
+    """The kinds fields depend on, and whether they may be unregistered."""
+    for field_info in field_infos:
+        operator = field_info.operator
+        ft = field_info.field_type
+        if isinstance(operator, Get):
+            yield operator.lookup_key, False
+        elif operator is None and not (
+            ft is None or ft is Registry or field_info.is_builtin
+        ):
+            yield ft, True
+
+
+class WarmupReport(NamedTuple):
+    """What ``Registry.warmup`` did, with seconds spent on each part."""
+
+    registrations: int
+    resolve: float
+    introspect: float
+    compile: float
+    instantiate: float
+    total: float
+    # Scoped registrations whose instances can't be built without props.
+    skipped: tuple[Registration, ...] = ()
+
+
+class BulkBlock(local):
+    """What a thread's ``bulk`` block adds and removes when it ends.
+
+    Each thread has its own, so another thread's registrations aren't
+    held back by the block, and only this thread adds to it.
+    """
+
+    def __init__(self) -> None:
+        """Start outside of a block."""
+        self.pending: Optional[list[tuple[Any, Addition]]] = None
+        self.removals: list[tuple[Any, Addition]] = []
+
+
+# What ``Registry.find`` returns when nothing is registered for a kind.
+NOT_FOUND = object()
+
+# How many lookups that found nothing a registry remembers. Anyone can
+# ask for any type, so unlike the answers, misses aren't bounded.
+MISSES_MAXSIZE = 1024
+
+
 class Registry:
     """Type-oriented registry with special features."""
 
     context: Optional[Any]
     parent: Optional[Registry]
-    scanner: Scanner
-    registrations: Registrations
+    cache_hits: int
+    cache_misses: int
+    is_committed: bool
+    lazy_introspection: bool
+    allow_duplicates: bool
+    tracker: Optional[DependencyTracker]
 
     def __init__(
         self,
         parent: Optional[Registry] = None,
         context: Optional[Any] = None,
+        lazy_introspection: Optional[bool] = None,
+        track_dependencies: Optional[bool] = None,
+        allow_duplicates: Optional[bool] = None,
     ) -> None:
-        """Construct a registry that might have a context and be nested."""
-        self.registrations = defaultdict(make_singletons_classes)
+        """Construct a registry that might have a context and be nested.
+
+        Child registries are cheap: until something is registered in them,
+        they have no registrations tree or scanner of their own and
+        answer lookups straight from the parent.
+
+        With ``lazy_introspection``, registered classes aren't introspected
+        until first injected, which speeds up scanning big packages. Child
+        registries default to the parent's setting.
+
+        With ``track_dependencies``, what cached instances read while being
+        constructed is recorded, for ``changed`` to invalidate them. Child
+        registries share the parent's tracking unless told otherwise.
+
+        With ``allow_duplicates``, a registration with the same provenance
+        as an earlier one for the same kind and context, e.g. from a second
+        scan of a package, is added in front of it rather than replacing
+        it. Child registries default to the parent's setting.
+        """
+        self._registrations: Optional[Registrations] = None
         self.parent: Optional[Registry] = parent
         if context is None and parent is not None:
             self.context = parent.context
         else:
             self.context = context
-        self.scanner = Scanner(registry=self)
+        if lazy_introspection is None:
+            lazy_introspection = parent.lazy_introspection if parent else False
+        self.lazy_introspection = lazy_introspection
+        if allow_duplicates is None:
+            allow_duplicates = parent.allow_duplicates if parent else False
+        self.allow_duplicates = allow_duplicates
+        parent_tracker = parent.tracker if parent else None
+        if track_dependencies is None:
+            self.tracker = parent_tracker
+        elif track_dependencies:
+            self.tracker = parent_tracker or DependencyTracker()
+        else:
+            self.tracker = None
+
+        # Memoized ``get_best_match`` answers, emptied whenever this
+        # registry or any of its parents gets a new registration.
+        self._cache: dict[ResolutionKey, Registration] = {}
+        self._misses: set[ResolutionKey] = set()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lineages: dict[Any, tuple[KindGroups, ...]] = {}
+        self._children: Optional[WeakSet[Registry]] = None
+
+        # Instances of registry and root lifetime registrations, by id.
+        self._instances: dict[int, tuple[Registration, Any]] = {}
+        self._tracked = False
+
+        # Registrations waiting for the end of a ``bulk`` block, and
+        # those to remove then, for each thread.
+        self._bulk = BulkBlock()
+
+        # The registrations with a provenance, to find their duplicates
+        # without walking the candidates. Only used by writers.
+        self._provenances: dict[ProvenanceKey, Registration] = {}
+
+        # What each module registered, by module name, for ``scan``.
+        self._module_scans: dict[str, ModuleScan] = {}
+
+        # Flat dispatch table compiled by ``commit``.
+        self.is_committed = False
+        self._dispatch: Optional[Mapping[ResolutionKey, Optional[Registration]]]
+        self._dispatch = None
+
+    @property
+    def registrations(self) -> Registrations:
+        """The tree of kind, singletons or classes, context, registrations."""
+        if self._registrations is None:
+            with _write_lock:
+                if self._registrations is None:
+                    self._registrations = {}
+                    # From now on, this registry has answers of its own.
+                    self._attach()
+        return self._registrations
+
+    @property
+    def root(self) -> Registry:
+        """The registry at the top of the parent chain."""
+        registry = self
+        while registry.parent is not None:
+            registry = registry.parent
+        return registry
+
+    @cached_property
+    def scanner(self) -> Scanner:
+        """The ``venusian`` scanner, made on first use."""
+        return Scanner(registry=self)
+
+    def _attach(self) -> None:
+        """Ask the parents to tell this registry about their changes."""
+        registry = self
+        parent = self.parent
+        while parent is not None:
+            children = parent._children
+            if children is None:
+                children = parent._children = WeakSet()
+            elif registry in children:
+                break
+            children.add(registry)
+            registry, parent = parent, parent.parent
+
+    def cache_info(self) -> CacheInfo:
+        """Report hits, misses, and size of the resolution cache."""
+        size = len(self._cache) + len(self._misses)
+        return CacheInfo(self.cache_hits, self.cache_misses, size)
+
+    def cache_clear(self) -> None:
+        """Empty the resolution cache here and in all child registries."""
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop answers that a new registration might have changed."""
+        # Lineages first: a reader seeing the new cache then also sees
+        # the new lineages, and can't fill it with stale answers.
+        self._lineages = {}
+        self._cache = {}
+        self._misses = set()
+        if self.is_committed:
+            # A parent changed underneath a committed registry.
+            self._dispatch = self._compile()
+        for child in list(self._children or ()):
+            child._invalidate()
+
+    def commit(self) -> None:
+        """Close registration and compile the flat dispatch table.
+
+        Every kind registered here or in a parent is resolved up-front
+        for each registered context class, so that ``get`` on those is a
+        single dict lookup. Further ``register`` calls raise a
+        ``ValueError`` until ``reopen`` is called.
+        """
+        with _write_lock:
+            self.is_committed = True
+            self._attach()
+            self._cache = {}
+            self._misses = set()
+            self._dispatch = self._compile()
+
+    def reopen(self) -> None:
+        """Allow registrations again after a ``commit``."""
+        with _write_lock:
+            self.is_committed = False
+            self._dispatch = None
+            self._invalidate()
+
+    def _compile(self) -> Mapping[ResolutionKey, Optional[Registration]]:
+        """Resolve all kinds and contexts in this chain into a flat table."""
+        dispatch: dict[ResolutionKey, Optional[Registration]] = {}
+        for kind, contexts in self._kind_contexts().items():
+            for context_class in contexts:
+                for allow_singletons in (True, False):
+                    key = (kind, context_class, allow_singletons)
+                    dispatch[key] = self._find_best_match(*key)
+        return MappingProxyType(dispatch)
+
+    def _kind_contexts(self) -> dict[Any, set[Optional[Any]]]:
+        """Each kind in this chain, with None and its registered contexts."""
+        kind_contexts: dict[Any, set[Optional[Any]]] = defaultdict(set)
+        registry: Optional[Registry] = self
+        while registry is not None:
+            # Copied in one step, as a writer may be adding a kind.
+            registrations = list((registry._registrations or {}).items())
+            for kind, kind_groups in registrations:
+                contexts = kind_contexts[kind]
+                contexts.add(None)
+                for group in (kind_groups["singletons"], kind_groups["classes"]):
+                    for this_context in group:
+                        if this_context is not IsNoneType:
+                            contexts.add(this_context)
+            registry = registry.parent
+        return kind_contexts
+
+    def _get_all_matches(
+        self, kind: Any, context_classes: Iterable[Optional[Any]]
+    ) -> list[Registration]:
+        """The best matches for a kind, with and without props."""
+        matches = []
+        for context_class in context_classes:
+            for allow_singletons in (True, False):
+                match = self.get_best_match(kind, context_class, allow_singletons)
+                if match is not None:
+                    matches.append(match)
+        return matches
+
+    def warmup(
+        self,
+        kinds: Optional[Iterable[Any]] = None,
+        contexts: Optional[Iterable[Any]] = None,
+    ) -> WarmupReport:
+        """Do the first-request work up front, e.g. before forking workers.
+
+        Starting from ``kinds``, by default all kinds in this chain, the
+        best matches are resolved, with and without props, for each of
+        ``contexts`` (classes or instances), by default None and each
+        context the kind is registered for. Their field types and ``Get``
+        operators lead to more kinds, until the whole reachable graph is
+        resolved, introspected, and compiled into injection plans. Then
+        the ``registry`` and ``root`` lifetime instances are constructed,
+        for registrations without a context or for this registry's
+        context. Returns how long each part took, and the registrations
+        whose instances couldn't be constructed without props.
+        """
+        started = perf_counter()
+        resolve = introspect = compile_plans = 0.0
+        kind_contexts = self._kind_contexts()
+        if contexts is not None:
+            contexts = {
+                None if c is None else c if isclass(c) else c.__class__
+                for c in contexts
+            }
+
+        # Kinds to visit, and whether they are dependencies, which can be
+        # constructed without being registered.
+        pending: list[tuple[Any, bool]] = [
+            (kind, False) for kind in (kind_contexts if kinds is None else kinds)
+        ]
+        seen: set[Any] = set()
+        registrations: dict[int, Registration] = {}
+        while pending:
+            kind, is_dependency = pending.pop()
+            if kind in seen:
+                continue
+            seen.add(kind)
+
+            start = perf_counter()
+            context_classes = kind_contexts.get(kind, {None})
+            matches = self._get_all_matches(
+                kind, context_classes if contexts is None else contexts
+            )
+            if not matches and is_dependency:
+                matches.append(get_unregistered_registration(kind))
+            resolve += perf_counter() - start
+
+            for registration in matches:
+                if id(registration) in registrations:
+                    continue
+                registrations[id(registration)] = registration
+                start = perf_counter()
+                field_infos = registration.field_infos
+                introspect += perf_counter() - start
+                start = perf_counter()
+                registration.plan  # noqa: B018
+                compile_plans += perf_counter() - start
+                pending.extend(get_field_dependencies(field_infos))
+
+        start = perf_counter()
+        skipped = self._warmup_instances(registrations.values())
+        instantiate = perf_counter() - start
+
+        return WarmupReport(
+            registrations=len(registrations),
+            resolve=resolve,
+            introspect=introspect,
+            compile=compile_plans,
+            instantiate=instantiate,
+            total=perf_counter() - started,
+            skipped=skipped,
+        )
+
+    def _warmup_instances(
+        self, registrations: Iterable[Registration]
+    ) -> tuple[Registration, ...]:
+        """Construct the scoped instances this registry would get.
+
+        Registrations for another context are left for a registry with
+        that context. Those that can't be constructed without props are
+        returned rather than raised.
+        """
+        skipped = []
+        for registration in registrations:
+            if registration.lifetime == "transient" or registration.is_singleton:
+                continue
+            context = registration.context
+            if context is not None and not (
+                isclass(context) and isinstance(self.context, context)
+            ):
+                continue
+            try:
+                self._get_scoped_instance(registration)
+            except (LookupError, TypeError, ValueError):
+                skipped.append(registration)
+        return tuple(skipped)
 
     def setup(
         self,
@@ -217,8 +1247,19 @@ class Registry:
     def scan(
         self,
         pkg: PACKAGE = None,
+        incremental: bool = False,
     ) -> None:
-        """Look for decorators that need to be registered."""
+        """Look for decorators that need to be registered.
+
+        With ``incremental``, modules whose files haven't changed since
+        the last incremental scan of the package aren't scanned again:
+        the registrations they made then are kept, and the classes they
+        define stay the same. Changed modules, and unchanged ones that
+        imported from them, are imported again and scanned, and the
+        registrations of those and of removed modules are replaced. The
+        registrations are the same as scanning the package in a new
+        registry.
+        """
         if pkg is None:
             # Get the caller module and import it
             pkg = caller_package()
@@ -226,12 +1267,144 @@ class Registry:
             # importlib.resource package specification
             pkg = import_module(pkg)
         if pkg is not None:
-            self.scanner.scan(pkg)
+            with self.bulk():
+                if incremental:
+                    self._scan_incremental(pkg)
+                else:
+                    self.scanner.scan(pkg)
+
+    def _scan_incremental(self, pkg: ModuleType) -> None:
+        """Scan the changed modules of a package, in a ``bulk`` block."""
+        # Notice new and changed files since the last scan.
+        invalidate_caches()
+        pending = cast("list[tuple[Any, Addition]]", self._bulk.pending)
+        module_scans = self._module_scans
+        prefix = pkg.__name__ + "."
+        previous = {
+            name: module_scan
+            for name, module_scan in module_scans.items()
+            if name == pkg.__name__ or name.startswith(prefix)
+        }
+
+        start = len(pending)
+        fingerprints: dict[str, Optional[ModuleFingerprint]] = {}
+        for module_name in iter_module_names(pkg):
+            module_scan = previous.get(module_name)
+            fingerprints[module_name] = fingerprint(
+                get_module_file(module_name),
+                module_scan.fingerprint if module_scan else None,
+            )
+        stale = {
+            name
+            for name, module_scan in previous.items()
+            if name not in fingerprints
+            or not is_unchanged(module_scan, fingerprints[name])
+        }
+        if not stale and previous.keys() == fingerprints.keys():
+            # Nothing changed, keep the registrations.
+            for name, this_fingerprint in fingerprints.items():
+                module_scans[name] = previous[name]._replace(
+                    fingerprint=this_fingerprint
+                )
+            return
+
+        # Unchanged modules holding on to what they imported from changed
+        # ones are imported again too. The others, and the kinds and
+        # contexts they define, are left alone.
+        stale |= find_importers(
+            {
+                name: modules[name]
+                for name in previous.keys() - stale
+                if name in modules
+            },
+            stale,
+        )
+        for module_name in stale:
+            modules.pop(module_name, None)
+            del module_scans[module_name]
+
+        # Scanning the package only scans its own members, not modules.
+        ignore_modules = fingerprints.keys().__contains__
+        for module_name, this_fingerprint in fingerprints.items():
+            module_scan = module_scans.get(module_name)
+            if module_scan is not None:
+                module_scans[module_name] = module_scan._replace(
+                    fingerprint=this_fingerprint
+                )
+                continue
+            module = import_module(module_name)
+            module_start = len(pending)
+            self.scanner.scan(module, ignore=ignore_modules)
+            module_scans[module_name] = ModuleScan(
+                this_fingerprint, tuple(pending[module_start:])
+            )
+        attach_submodules(fingerprints, modules)
+        # Replace the package's registrations, to keep the scanning order.
+        for module_scan in previous.values():
+            self._bulk.removals.extend(module_scan.registrations)
+        pending[start:] = [
+            entry
+            for module_name in fingerprints
+            for entry in module_scans[module_name].registrations
+        ]
+
+    def make_manifest(self) -> list[ManifestEntry]:
+        """List the registrations made in this registry, by dotted name.
+
+        Meant to run after a ``scan`` at build time, writing the result
+        with ``hopscotch.persistence.write_manifest`` for ``load_manifest``.
+        Kinds, contexts, and implementations must be importable by name.
+        Registrations are listed in the order to register them again.
+        """
+        entries: list[ManifestEntry] = []
+        for kind, kind_groups in (self._registrations or {}).items():
+            for group in (kind_groups["singletons"], kind_groups["classes"]):
+                for this_context, these_registrations in group.items():
+                    for registration in reversed(these_registrations):
+                        context = None if this_context is IsNoneType else this_context
+                        entries.append(make_manifest_entry(kind, context, registration))
+        return entries
+
+    def load_manifest(self, path: Union[str, Path]) -> None:
+        """Register what a manifest lists, without importing implementations.
+
+        Kinds and contexts are imported now, as lookups need them. Each
+        implementation is imported when ``get_best_match`` first chooses
+        it, so startup doesn't pay for components that aren't used.
+        """
+        if self.is_committed:
+            msg = "Registry is committed, call reopen() before registering"
+            raise ValueError(msg)
+        with self.bulk():
+            for entry in read_manifest(path):
+                context = entry["context"]
+                registration = Registration(
+                    implementation=None,
+                    import_path=entry["implementation"],
+                    kind=import_target(entry["kind"]),
+                    context=None if context is None else import_target(context),
+                    is_singleton=entry["is_singleton"],
+                    lazy=self.lazy_introspection,
+                    lifetime=cast(Lifetime, entry["lifetime"]),
+                    memoize=entry["memoize"],
+                    provenance=make_provenance(
+                        entry["implementation"],
+                        entry["decorator"],
+                        f"manifest {path}",
+                    ),
+                )
+                self._add_registration(registration.kind, registration)
 
     def inject(self, registration: Registration, props: Optional[Props] = None) -> T:
         """Use injection to construct and return an instance."""
         return inject_callable(registration, props=props, registry=self)
 
+    async def ainject(
+        self, registration: Registration, props: Optional[Props] = None
+    ) -> Any:
+        """Use async injection to construct and return an instance."""
+        return await ainject_callable(registration, props=props, registry=self)
+
     def get_best_match(
         self,
         kind: Type[T],
@@ -242,65 +1415,127 @@ class Registry:
 
         Using the registry is a two-step process: lookup an implementation,
         then if needed, construct and return. This is the first part.
+
+        Answers are memoized per ``(kind, context_class, allow_singletons)``
+        until the next registration in this registry or a parent. Lookups
+        that find nothing are remembered too, but only up to
+        ``MISSES_MAXSIZE`` of them. Nothing in the registry is changed,
+        though a registration made by dotted name is imported when it is
+        first chosen.
         """
-        tr = self.registrations[kind]
-        if allow_singletons:
-            registrations = tr["singletons"] | tr["classes"]
-        else:
-            registrations = tr["classes"]
-
-        # We will put possible matches into three piles: high/medium/low
-        # precedence. Each pile is an ordered list based on registration
-        # time (later registrations override earlier.)
-        precedences: dict[str, list[Registration]] = {
-            "high": [],
-            "medium": [],
-            "low": [],
-        }
-        for this_context, these_registrations in registrations.items():
-            if this_context is IsNoneType and context_class is None:
-                # This is the most basic case, test it first to bail out quickly.
-                precedences["low"] = these_registrations
-            elif this_context is context_class:
-                precedences["high"] = these_registrations
-            elif this_context is IsNoneType:
-                precedences["low"] = these_registrations
-            if this_context is not IsNoneType:
-                # TODO mypy didn't like issubclass(context_class, this_context)
-                if context_class and issubclass(
-                    context_class, cast(type, this_context)
-                ):
-                    precedences["medium"] = these_registrations
-            # Otherwise, filter it out and do nothing
-
-        # Get the first match and return (is_singleton=True) or construct
-        # and return (is_singleton = False)
-        matches = precedences["high"] + precedences["medium"] + precedences["low"]
-
-        # If we found a match, return it
-        if matches:
-            return matches[0]
-        else:
-            if self.parent:
-                # Otherwise, go to parent
-                return self.parent.get_best_match(
-                    kind,
-                    context_class=context_class,
-                    allow_singletons=allow_singletons,
-                )
+        key = (kind, context_class, allow_singletons)
+        if self._dispatch is not None:
+            match = self._dispatch.get(key, _NOT_CACHED)
+            if match is not _NOT_CACHED:
+                best_match = cast("Optional[Registration]", match)
+                if best_match is not None and not best_match.is_loaded:
+                    best_match.load()
+                return best_match
+        elif self._registrations is None and self.parent is not None:
+            # Nothing registered here, so share the parent's answers.
+            return self.parent.get_best_match(
+                kind,
+                context_class=context_class,
+                allow_singletons=allow_singletons,
+            )
+
+        # Hold on to these caches: if a registration replaces them
+        # meanwhile, a possibly stale answer goes into the discarded ones.
+        cache = self._cache
+        misses = self._misses
+        cached = cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        elif key in misses:
+            self.cache_hits += 1
             return None
 
-    def get(  # noqa: C901
+        self.cache_misses += 1
+        match = self._find_best_match(kind, context_class, allow_singletons)
+        if match is not None:
+            if not match.is_loaded:
+                # Import a registration made by dotted name, once chosen.
+                match.load()
+            cache[key] = match
+        else:
+            if len(misses) >= MISSES_MAXSIZE:
+                # Start over rather than track which miss is oldest.
+                misses.clear()
+            misses.add(key)
+        return match
+
+    def _find_best_match(
         self,
         kind: Type[T],
-        context: Optional[Any] = None,
-        **kwargs: Props,
-    ) -> T:
-        """Find an appropriate kind class and construct an implementation.
+        context_class: Optional[Any],
+        allow_singletons: bool,
+    ) -> Optional[Registration]:
+        """Do the uncached work of ``get_best_match``.
 
-        The passed-in keyword args act as "props" which have highest-precedence
-        as arguments used in construction.
+        Precedence follows the context class MRO: an exact match, then
+        the nearest registered ancestor, then an ABC the context class
+        is registered with, then registrations without a context. Within
+        one context, the latest registration wins, and the nearest
+        registry in the chain wins over its parents.
         """
+        # Only look at the registries in the chain which know this kind.
+        lineage = self._lineage(kind)
+        contexts = get_contexts(context_class, lineage)
+        for kind_groups in lineage:
+            match = match_kind_groups(kind_groups, contexts, allow_singletons)
+            if match is not None:
+                return match
+        return None
+
+    def iter_candidates(
+        self,
+        kind: Any,
+        context_class: Optional[Any] = None,
+        allow_singletons: bool = True,
+    ) -> Iterator[Registration]:
+        """List the registrations that could be chosen, best first.
+
+        The first is what ``get_best_match`` chooses, the others are
+        hidden behind it, in the order they would take its place.
+        Registrations made by dotted name aren't imported.
+        """
+        lineage = self._lineage(kind)
+        contexts = get_contexts(context_class, lineage)
+        for kind_groups in lineage:
+            for this_context in contexts:
+                yield from kind_groups["classes"].get(this_context, ())
+                if allow_singletons:
+                    yield from kind_groups["singletons"].get(this_context, ())
+
+    def _lineage(self, kind: Any) -> tuple[KindGroups, ...]:
+        """Registrations of a kind in this registry and its parents.
+
+        Nearest first, skipping registries without the kind. Built lazily
+        from the parent's lineage and kept until this registry or a parent
+        changes. Kinds that no registry in the chain knows aren't kept, as
+        their misses are remembered by ``get_best_match``.
+        """
+        if self._registrations is None and self.parent is not None:
+            return self.parent._lineage(kind)
+        lineages = self._lineages
+        lineage = lineages.get(kind)
+        if lineage is None:
+            lineage = self.parent._lineage(kind) if self.parent else ()
+            kind_groups = (self._registrations or {}).get(kind)
+            if kind_groups is not None:
+                lineage = (kind_groups, *lineage)
+            if lineage:
+                lineages[kind] = lineage
+        return lineage
+
+    def _get_match(
+        self,
+        kind: Any,
+        context: Optional[Any],
+        kwargs: Props,
+    ) -> Optional[Registration]:
+        """Find the best match for ``get`` and ``aget``, recording the read."""
         # Use the passed-in context class if provided, otherwise, the
         # the registry's context (if provided.)
         context_class: Optional[Any] = None
@@ -317,20 +1552,237 @@ class Registry:
             # allow_singletons when bool(kwargs) is false.
             allow_singletons=not bool(kwargs),
         )
-        if best_match:
-            if best_match.is_singleton:
-                # TODO Now that ``.get()`` makes promises about typing, it makes
-                #    registering a singleton for a "kind" a good bit harder.
-                #    We'll just shut this up for now.
-                return best_match.implementation  # type: ignore
+        if self.tracker is not None:
+            # Even a miss was read: registering this kind would change it.
+            record(kind)
+            if best_match is not None:
+                record(registration_dependency(best_match))
+        return best_match
+
+    def get(
+        self,
+        kind: Type[T],
+        context: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Find an appropriate kind class and construct an implementation.
+
+        The passed-in keyword args act as "props" which have highest-precedence
+        as arguments used in construction.
+        """
+        instance = self.find(kind, context, **kwargs)
+        if instance is NOT_FOUND:
+            # We didn't find anything, raise an error
+            msg = f"No kind {kind.__name__!r} in registry"
+            raise LookupError(msg)
+        return instance  # type: ignore
+
+    def find(
+        self,
+        kind: Any,
+        context: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Like ``get``, but return ``NOT_FOUND`` instead of raising.
+
+        Injection uses this, as for it an unregistered dependency is
+        normal rather than an error.
+        """
+        best_match = self._get_match(kind, context, kwargs)
+        if best_match is None:
+            return NOT_FOUND
+        return self._construct(best_match, kwargs)
+
+    def _construct(self, best_match: Registration, kwargs: Props) -> Any:
+        """Return the instance for a registration ``find`` matched."""
+        if best_match.is_singleton:
+            # TODO Now that ``.get()`` makes promises about typing, it makes
+            #    registering a singleton for a "kind" a good bit harder.
+            #    We'll just shut this up for now.
+            return best_match.implementation
+        elif best_match.lifetime != "transient" and not kwargs:
+            # Construct once, then reuse from the owning registry.
+            return self._get_scoped_instance(best_match)
+        else:
+            # Need to construct it
+            return self.inject(best_match, props=kwargs)
+
+    def get_batch(
+        self,
+        kind: Type[T],
+        contexts: Optional[Iterable[Any]] = None,
+        props: Optional[Iterable[Props]] = None,
+    ) -> list[T]:
+        """Construct a kind for each of many contexts and/or props.
+
+        Returns the instances in order. See ``iter_batch``.
+        """
+        return list(self.iter_batch(kind, contexts=contexts, props=props))
+
+    def iter_batch(
+        self,
+        kind: Type[T],
+        contexts: Optional[Iterable[Any]] = None,
+        props: Optional[Iterable[Props]] = None,
+    ) -> Iterator[T]:
+        """Lazily construct a kind for each of many contexts and/or props.
+
+        Pass ``contexts``, ``props``, or both to pair them up. The
+        registration is matched once per context class, not per item,
+        and each distinct context object gets one child registry, so
+        items for the same context share its ``registry`` lifetime
+        dependencies.
+        """
+        if contexts is None and props is None:
+            raise ValueError("Pass contexts, props, or both")
+        elif contexts is None:
+            items: Iterable[tuple[Any, Props]] = ((None, p) for p in props or ())
+        elif props is None:
+            items = ((context, {}) for context in contexts)
+        else:
+            items = zip(contexts, props, strict=True)
+
+        matches: dict[tuple[Any, bool], Optional[Registration]] = {}
+        registries: dict[int, Registry] = {}
+        for context, these_props in items:
+            if context is None:
+                registry = self
+                context_class = self.context.__class__ if self.context else None
             else:
-                # Need to construct it
-                instance: T = self.inject(best_match, props=kwargs)
-                return instance
+                # Keyed by id, and the child keeps the context alive.
+                child = registries.get(id(context))
+                if child is None:
+                    child = Registry(parent=self, context=context)
+                    registries[id(context)] = child
+                registry = child
+                context_class = context.__class__
+
+            key = (context_class, bool(these_props))
+            best_match = matches.get(key, _NOT_CACHED)
+            if best_match is _NOT_CACHED:
+                best_match = matches[key] = self.get_best_match(
+                    kind,
+                    context_class=context_class,
+                    allow_singletons=not these_props,
+                )
+            if best_match is None:
+                msg = f"No kind {kind.__name__!r} in registry"
+                raise LookupError(msg)
+            if self.tracker is not None:
+                record(kind)
+                record(registration_dependency(best_match))
+            yield registry._construct(cast("Registration", best_match), these_props)
+
+    async def aget(
+        self,
+        kind: Type[T],
+        context: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Like ``get``, but awaits async factories and operators.
 
-        # If we get to here, we didn't find anything, raise an error
-        msg = f"No kind {kind.__name__!r} in registry"
-        raise LookupError(msg)
+        Independent fields, at every level of the construction, are
+        resolved concurrently.
+        """
+        instance = await self.afind(kind, context, **kwargs)
+        if instance is NOT_FOUND:
+            msg = f"No kind {kind.__name__!r} in registry"
+            raise LookupError(msg)
+        return instance  # type: ignore
+
+    async def afind(
+        self,
+        kind: Any,
+        context: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Like ``aget``, but return ``NOT_FOUND`` instead of raising."""
+        best_match = self._get_match(kind, context, kwargs)
+        if best_match is None:
+            return NOT_FOUND
+        elif best_match.is_singleton:
+            return best_match.implementation
+        elif best_match.lifetime != "transient" and not kwargs:
+            return await self._aget_scoped_instance(best_match)
+        else:
+            return await self.ainject(best_match, props=kwargs)
+
+    def _get_scoped_instance(self, registration: Registration) -> Any:
+        """Return the instance of a registration, constructing it once.
+
+        ``registry`` lifetimes are kept on this registry and ``root``
+        lifetimes on the registry holding the registration, which also
+        does the injection. Either way they go away with that registry.
+        """
+        owner = self._get_owner(registration)
+        scoped = owner._instances.get(id(registration))
+        if scoped is None:
+            if owner.tracker is None:
+                return owner._keep_scoped(registration, owner.inject(registration))
+            with recording() as reads:
+                instance: Any = owner.inject(registration)
+            return owner._keep_scoped(registration, instance, reads)
+        return scoped[1]
+
+    async def _aget_scoped_instance(self, registration: Registration) -> Any:
+        """Like ``_get_scoped_instance``, constructing with ``ainject``."""
+        owner = self._get_owner(registration)
+        scoped = owner._instances.get(id(registration))
+        if scoped is None:
+            if owner.tracker is None:
+                instance = await owner.ainject(registration)
+                return owner._keep_scoped(registration, instance)
+            with recording() as reads:
+                instance = await owner.ainject(registration)
+            return owner._keep_scoped(registration, instance, reads)
+        return scoped[1]
+
+    def _get_owner(self, registration: Registration) -> Registry:
+        """Return the registry that injects and keeps a scoped instance."""
+        if registration.lifetime == "root" and registration.holder is not None:
+            holder = registration.holder()
+            if holder is not None:
+                return holder
+        return self
+
+    def _keep_scoped(
+        self,
+        registration: Registration,
+        instance: Any,
+        reads: Optional[set[Any]] = None,
+    ) -> Any:
+        """Keep a scoped instance, unless one was kept meanwhile."""
+        key = id(registration)
+        instances = self._instances
+        tracker = self.tracker
+        if tracker is not None and reads is not None and key not in instances:
+            if not self._tracked:
+                # Forget the tracked instances when the registry goes.
+                finalize(self, tracker.discard_owner, id(self))
+                self._tracked = True
+            evict = partial(instances.pop, key, None)
+            tracker.add(id(self), key, instance, registration, reads, evict)
+        # Keep the registration alive so its id stays unique.
+        return instances.setdefault(key, (registration, instance))[1]
+
+    def changed(self, *dependencies: Any) -> list[Any]:
+        """Evict the cached instances that read what changed.
+
+        Dependencies are registrations, kinds, or operators such as
+        ``Context("title")``. Instances of ``registry`` or ``root``
+        lifetimes, and memoized instances, that read them while being
+        constructed are evicted, as are instances that depended on those.
+        Returns the evicted instances.
+        """
+        if self.tracker is None:
+            raise ValueError("Registry is not tracking dependencies")
+        keys = [
+            registration_dependency(dependency)
+            if isinstance(dependency, Registration)
+            else dependency
+            for dependency in dependencies
+        ]
+        return self.tracker.changed(*keys)
 
     def register(
         self,
@@ -338,11 +1790,34 @@ class Registry:
         *,
         kind: Optional[Type[T]] = None,
         context: Optional[Any] = None,
+        lifetime: Lifetime = "transient",
+        memoize: Union[bool, int] = False,
+        provenance: Optional[Provenance] = None,
     ) -> None:
         """Use a LIFO list for all the possible implementations.
 
         Note that the implementation must be a subclass of the kind.
+
+        A class can have a ``lifetime`` other than ``"transient"``, to be
+        constructed once per registry it is asked from (``"registry"``)
+        or once per root registry (``"root"``) rather than on each ``get``.
+
+        A frozen dataclass or ``NamedTuple`` can ``memoize``: instances are
+        remembered by their construction arguments, in a least-recently
+        used cache of ``memoize`` entries (or a default size if ``True``.)
+
+        Decorators pass their ``provenance``. A registration with the same
+        provenance as an earlier one for the same kind and context is a
+        duplicate, e.g. from scanning a package twice, and replaces it
+        unless the registry has ``allow_duplicates``.
         """
+        if self.is_committed:
+            msg = "Registry is committed, call reopen() before registering"
+            raise ValueError(msg)
+        if lifetime not in LIFETIMES:
+            msg = f"Unknown lifetime {lifetime!r}"
+            raise ValueError(msg)
+
         is_singleton = not isclass(implementation)
 
         registration = Registration(
@@ -350,6 +1825,10 @@ class Registry:
             context=context,
             kind=kind,
             is_singleton=is_singleton,
+            lazy=self.lazy_introspection,
+            lifetime=lifetime,
+            memoize=memoize,
+            provenance=provenance,
         )
 
         # Let's decide what key to use to register this as.
@@ -368,13 +1847,207 @@ class Registry:
         else:
             st = kind
 
-        # Put this in the correct place of the registrations tree,
-        # creating tree nodes as needed.
+        self._add_registration(st, registration)
+
+    def register_lazy(
+        self,
+        import_path: str,
+        *,
+        kind: Type[T],
+        context: Optional[Any] = None,
+        lifetime: Lifetime = "transient",
+        memoize: Union[bool, int] = False,
+        provenance: Optional[Provenance] = None,
+    ) -> None:
+        """Register a class by its ``"module:qualname"`` dotted name.
+
+        It is only imported and introspected when a lookup first chooses
+        it, so registering many of them is cheap. As there is no class
+        to look at yet, the ``kind`` is required.
+        """
+        if self.is_committed:
+            msg = "Registry is committed, call reopen() before registering"
+            raise ValueError(msg)
+        if lifetime not in LIFETIMES:
+            msg = f"Unknown lifetime {lifetime!r}"
+            raise ValueError(msg)
+
+        registration = Registration(
+            implementation=None,
+            import_path=import_path,
+            context=context,
+            kind=kind,
+            lazy=self.lazy_introspection,
+            lifetime=lifetime,
+            memoize=memoize,
+            provenance=provenance
+            or make_provenance(import_path, location=caller_location()),
+        )
+        self._add_registration(kind, registration)
+
+    def _add_registration(self, st: Any, registration: Registration) -> None:
+        """Add a registration for a kind, now or at the end of ``bulk``."""
+        s_or_c: Literal["singletons", "classes"]
+        s_or_c = "singletons" if registration.is_singleton else "classes"
+        context = registration.context
+        this_context = IsNoneType if context is None else cast(type, context)
+        pending = self._bulk.pending
+        if pending is not None:
+            # In a ``bulk`` block, add it at the end.
+            pending.append((st, (s_or_c, this_context, registration)))
+        else:
+            self._add([(st, (s_or_c, this_context, registration))])
 
-        s_or_c = "singletons" if is_singleton else "classes"
-        registrations = self.registrations[st][s_or_c]  # type: ignore
-        this_context = IsNoneType if context is None else context
-        registrations[this_context].insert(0, registration)
+    def register_many(
+        self,
+        implementations: Iterable[Any],
+        *,
+        kind: Optional[Any] = None,
+        context: Optional[Any] = None,
+        lifetime: Lifetime = "transient",
+        memoize: Union[bool, int] = False,
+    ) -> None:
+        """Register many implementations with the same options at once."""
+        with self.bulk():
+            for implementation in implementations:
+                self.register(
+                    implementation,
+                    kind=kind,
+                    context=context,
+                    lifetime=lifetime,
+                    memoize=memoize,
+                )
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """Register many things, updating the registry once at the end.
+
+        Registrations made in the block, e.g. by a ``scan``, are only
+        visible once the block ends. Each kind's groups are then rebuilt
+        once and the caches here and in child registries are emptied once,
+        rather than for each registration. The block only holds back the
+        registrations made by its own thread.
+        """
+        block = self._bulk
+        if block.pending is not None:
+            # Already in a bulk block, which will add these too.
+            yield
+            return
+        pending: list[tuple[Any, Addition]] = []
+        block.pending = pending
+        try:
+            yield
+        finally:
+            block.pending = None
+            removals, block.removals = block.removals, []
+            if pending or removals:
+                self._add(pending, removals)
+
+    def compact(self) -> int:
+        """Drop registrations that newer ones hide for good.
+
+        Only the newest registration of a kind for a context is chosen.
+        The older ones behind it are kept in case it goes away, which
+        only an incremental ``scan`` does to its registrations. Behind
+        the newest one that didn't come from an incremental scan, they
+        are dropped. Returns how many were dropped.
+        """
+        removable = {
+            id(registration)
+            for module_scan in self._module_scans.values()
+            for _, (_, _, registration) in module_scan.registrations
+        }
+        dropped = 0
+        with _write_lock:
+            registrations = self._registrations or {}
+            for st, kind_groups in list(registrations.items()):
+                hidden: set[int] = set()
+                candidates: Optional[Candidates]
+                for s_or_c in ("singletons", "classes"):
+                    group = kind_groups[s_or_c]
+                    for this_context, candidates in group.items():
+                        while candidates and id(candidates.newest) in removable:
+                            candidates = candidates.older
+                        hiding = candidates.older if candidates else None
+                        for registration in hiding or ():
+                            hidden.add(id(registration))
+                            self._forget(st, (s_or_c, this_context, registration))
+                if hidden:
+                    registrations[st] = remove_from_kind_groups(kind_groups, hidden)
+                    dropped += len(hidden)
+            if dropped:
+                # Answers are the same, but let go of the old kind groups.
+                self._invalidate()
+        return dropped
+
+    def _forget(self, st: Any, addition: Addition) -> None:
+        """Let go of what a registration that is going away left behind."""
+        registration = addition[2]
+        self._instances.pop(id(registration), None)
+        key = get_provenance_key(st, addition)
+        if key is not None and self._provenances.get(key) is registration:
+            del self._provenances[key]
+
+    def _add(
+        self,
+        pending: list[tuple[Any, Addition]],
+        removals: Iterable[tuple[Any, Addition]] = (),
+    ) -> None:
+        """Put registrations in the registrations tree, by kind.
+
+        The ``removals`` are taken out first, so a registration can be
+        both removed and added back, e.g. to move it to the front. Then,
+        unless duplicates are allowed, so are the registrations the new
+        ones replace.
+        """
+        additions: dict[Any, list[Addition]] = defaultdict(list)
+        for st, addition in pending:
+            additions[st].append(addition)
+        removed: dict[Any, set[int]] = defaultdict(set)
+        for st, addition in removals:
+            removed[st].add(id(addition[2]))
+        kinds = [*removed, *(st for st in additions if st not in removed)]
+
+        # Each kind's groups are copied and swapped in whole, so readers
+        # see them either before or after, never half-updated.
+        with _write_lock:
+            for _, (_, _, registration) in pending:
+                registration.holder = ref(self)
+            for st, addition in removals:
+                self._forget(st, addition)
+            for st in kinds:
+                self._update_kind(st, removed.get(st, set()), additions.get(st, []))
+            self._invalidate()
+        if self.tracker is not None:
+            # Whatever got these kinds might get something else now.
+            self.tracker.changed(*kinds)
+
+    def _update_kind(
+        self,
+        st: Any,
+        removed: set[int],
+        additions: list[Addition],
+    ) -> None:
+        """Swap in a kind's groups, with registrations removed and added.
+
+        Unless duplicates are allowed, the registrations the additions
+        replace are removed too. Called with the write lock held.
+        """
+        registrations = self.registrations
+        provenances = self._provenances
+        kind_groups = registrations.get(st) or make_singletons_classes()
+        if additions and not self.allow_duplicates:
+            replaced, additions = find_duplicates(provenances, st, additions)
+            for registration_id in replaced:
+                self._instances.pop(registration_id, None)
+            removed = removed | replaced
+        if removed:
+            kind_groups = remove_from_kind_groups(kind_groups, removed)
+        for addition in additions:
+            key = get_provenance_key(st, addition)
+            if key is not None:
+                provenances[key] = addition[2]
+        registrations[st] = add_to_kind_groups(kind_groups, additions)
 
 
 class injectable:  # noqa
@@ -390,11 +2063,15 @@ class injectable:  # noqa
         kind: Optional[Type[T]] = None,
         *,
         context: Optional[Optional[Any]] = None,
+        lifetime: Lifetime = "transient",
+        memoize: Union[bool, int] = False,
     ):
         """Construct decorator that can register later with registry."""
         if kind:
             self.kind = kind
         self.context = context
+        self.lifetime = lifetime
+        self.memoize = memoize
 
     def __call__(self, wrapped: T) -> T:
         """Execute the decorator during venusian scan phase."""
@@ -409,6 +2086,11 @@ class injectable:  # noqa
                 implementation=target,
                 kind=self.kind,
                 context=self.context,
+                lifetime=self.lifetime,
+                memoize=self.memoize,
+                provenance=Provenance(
+                    cls.__module__, cls.__qualname__, type(self).__qualname__
+                ),
             )
 
         attach(wrapped, callback)
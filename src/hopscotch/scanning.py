@@ -0,0 +1,147 @@
+"""Remember what scanning each module registered, to skip it next time.
+
+A dev server or CI rebuild scans the same package over and over, while
+only a few of its modules changed. An incremental scan fingerprints each
+module file and keeps the registrations its decorators made, so only
+changed modules, and those that imported from them, are imported again
+and have their callbacks run.
+"""
+from __future__ import annotations
+
+import os
+from hashlib import sha256
+from importlib.util import find_spec
+from pkgutil import walk_packages
+from types import ModuleType
+from typing import Any
+from typing import Collection
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+
+
+class ModuleFingerprint(NamedTuple):
+    """A module file's mtime in nanoseconds, size, and content hash."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+class ModuleScan(NamedTuple):
+    """What a module looked like, and what scanning it registered.
+
+    The registrations are kept as the kind and where in the kind's
+    groups each one went, in the order they were registered.
+    """
+
+    fingerprint: Optional[ModuleFingerprint]
+    registrations: tuple[tuple[Any, Any], ...]
+
+
+def get_module_file(module_name: str) -> Optional[str]:
+    """Find the source file of a module without importing it."""
+    try:
+        spec = find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.has_location:
+        # A namespace package, or a module that was removed.
+        return None
+    return spec.origin
+
+
+def fingerprint(
+    path: Optional[str],
+    previous: Optional[ModuleFingerprint] = None,
+) -> Optional[ModuleFingerprint]:
+    """Fingerprint a module file, only hashing it if mtime or size changed."""
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if (
+        previous is not None
+        and previous.mtime_ns == stat.st_mtime_ns
+        and previous.size == stat.st_size
+    ):
+        return previous
+    with open(path, "rb") as f:
+        digest = sha256(f.read()).hexdigest()
+    return ModuleFingerprint(stat.st_mtime_ns, stat.st_size, digest)
+
+
+def is_unchanged(
+    scan: Optional[ModuleScan],
+    this_fingerprint: Optional[ModuleFingerprint],
+) -> bool:
+    """Whether a module's contents are the same as when it was scanned."""
+    if scan is None:
+        return False
+    elif scan.fingerprint is None or this_fingerprint is None:
+        return scan.fingerprint is this_fingerprint
+    return scan.fingerprint.digest == this_fingerprint.digest
+
+
+def iter_module_names(package: ModuleType) -> Iterator[str]:
+    """The package and its modules, in the order ``venusian`` scans them."""
+    yield package.__name__
+    path = getattr(package, "__path__", None)
+    if path is not None:
+        for module_info in walk_packages(path, package.__name__ + "."):
+            yield module_info.name
+
+
+def _imports_from(module: ModuleType, module_names: Collection[str]) -> bool:
+    """Does the module hold modules, or what they define, of these names?"""
+    for key, value in list(vars(module).items()):
+        name: Optional[str]
+        if isinstance(value, ModuleType):
+            name = value.__name__
+            if name == f"{module.__name__}.{key}":
+                # A package's own submodule, which is attached again.
+                continue
+        else:
+            name = getattr(value, "__module__", None)
+        if isinstance(name, str) and name in module_names:
+            return True
+    return False
+
+
+def find_importers(
+    candidates: Mapping[str, ModuleType], module_names: Collection[str]
+) -> set[str]:
+    """Find the candidates that imported from the modules, or their importers.
+
+    What a module imported is bound in its globals, so it keeps the old
+    classes when a module it imported from is imported again.
+    """
+    found: set[str] = set()
+    stale = set(module_names)
+    remaining = dict(candidates)
+    while True:
+        importers = {
+            name for name, module in remaining.items() if _imports_from(module, stale)
+        }
+        if not importers:
+            return found
+        found |= importers
+        stale |= importers
+        for name in importers:
+            del remaining[name]
+
+
+def attach_submodules(module_names: Iterable[str], modules: Mapping[str, Any]) -> None:
+    """Make imported submodules attributes of their parent package again.
+
+    A package imported again doesn't have the submodules that weren't.
+    """
+    for module_name in module_names:
+        parent, _, child = module_name.rpartition(".")
+        if parent in modules and module_name in modules:
+            if getattr(modules[parent], child, None) is not modules[module_name]:
+                setattr(modules[parent], child, modules[module_name])
@@ -0,0 +1,224 @@
+"""Record what each cached component read, to invalidate on change.
+
+While a component is constructed, the registration lookups and
+operators it uses are recorded as its dependencies. When the result is
+kept -- a ``registry`` or ``root`` lifetime instance, or a memoized
+component -- the ``DependencyTracker`` remembers those dependencies.
+Marking a dependency as changed then evicts exactly the cached
+instances that depended on it, and, in turn, those that depended on
+them.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import replace
+from threading import RLock
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+from .memo import Identity
+from .operators import Context
+
+# The dependencies read by the construction in progress, if tracking.
+_current_reads: ContextVar[Optional[set[Hashable]]] = ContextVar(
+    "hopscotch_current_reads", default=None
+)
+
+
+def record(dependency: Any) -> None:
+    """Note that the construction in progress read a dependency."""
+    reads = _current_reads.get()
+    if reads is not None:
+        reads.add(dependency)
+
+
+@contextmanager
+def recording() -> Iterator[set[Hashable]]:
+    """Collect the dependencies read inside the block.
+
+    They also count as read by any enclosing construction, as what it
+    built from them would change too.
+    """
+    reads: set[Hashable] = set()
+    token = _current_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _current_reads.reset(token)
+        outer_reads = _current_reads.get()
+        if outer_reads is not None:
+            outer_reads |= reads
+
+
+def registration_dependency(registration: Any) -> Identity:
+    """The dependency key for a registration, which is unhashable."""
+    return Identity(registration)
+
+
+def expand_dependency(dependency: Hashable) -> tuple[Hashable, ...]:
+    """A change also affects readers of the same thing, less specifically.
+
+    A changed ``Context("title")`` affects readers of the whole context,
+    ``Context()``. A changed ``Context()`` is matched against every
+    attribute in ``DependencyTracker.changed``.
+    """
+    if isinstance(dependency, Context) and dependency.attr is not None:
+        return dependency, replace(dependency, attr=None)
+    return (dependency,)
+
+
+class TrackedEntry(NamedTuple):
+    """A cached instance, what it depends on, and how to evict it."""
+
+    instance: Any
+    registration: Any
+    dependencies: frozenset[Hashable]
+    evict: Callable[[], object]
+
+
+# A cached instance is identified by its cache, the "owner", and its key there.
+EntryKey = tuple[Hashable, Hashable]
+
+
+def _discard_from(
+    index: dict[Any, set[EntryKey]], key: Hashable, entry_key: EntryKey
+) -> None:
+    """Remove an entry from one set of an index, dropping emptied sets."""
+    entry_keys = index.get(key)
+    if entry_keys is not None:
+        entry_keys.discard(entry_key)
+        if not entry_keys:
+            del index[key]
+
+
+@dataclass()
+class DependencyTracker:
+    """The dependency graph of cached instances.
+
+    Registries sharing it may be used from many threads, so it is only
+    changed while holding its lock.
+    """
+
+    def __post_init__(self) -> None:
+        """Start with an empty graph."""
+        self._entries: dict[EntryKey, TrackedEntry] = {}
+        self._dependents: dict[Hashable, set[EntryKey]] = {}
+        self._instances_of: dict[Identity, set[EntryKey]] = {}
+        self._of_owner: dict[Hashable, set[EntryKey]] = {}
+        # Reentrant, as the evict callbacks it calls may use the tracker.
+        self._lock = RLock()
+        # Owners that went away, their instances dropped by the next call.
+        self._dead_owners: list[Hashable] = []
+
+    def __len__(self) -> int:
+        """The number of cached instances tracked."""
+        with self._lock:
+            self._drop_dead_owners()
+            return len(self._entries)
+
+    def add(
+        self,
+        owner: Hashable,
+        cache_key: Hashable,
+        instance: Any,
+        registration: Any,
+        dependencies: Iterable[Hashable],
+        evict: Callable[[], object],
+    ) -> None:
+        """Track an instance cached under a key by its owner."""
+        entry_key = (owner, cache_key)
+        entry = TrackedEntry(instance, registration, frozenset(dependencies), evict)
+        with self._lock:
+            self._drop_dead_owners()
+            self._remove(entry_key)
+            self._entries[entry_key] = entry
+            self._of_owner.setdefault(owner, set()).add(entry_key)
+            own_key = registration_dependency(registration)
+            self._instances_of.setdefault(own_key, set()).add(entry_key)
+            for dependency in entry.dependencies:
+                self._dependents.setdefault(dependency, set()).add(entry_key)
+
+    def discard(self, owner: Hashable, cache_key: Hashable) -> None:
+        """Stop tracking an instance its owner no longer caches."""
+        with self._lock:
+            self._remove((owner, cache_key))
+
+    def discard_owner(self, owner: Hashable) -> None:
+        """Stop tracking all instances of an owner, e.g. a dead registry.
+
+        A finalizer calls this, which can happen during garbage
+        collection in the middle of another call, even one holding the
+        lock. So the owner is only noted here, and the next call drops
+        its instances.
+        """
+        self._dead_owners.append(owner)
+
+    def _drop_dead_owners(self) -> None:
+        """Forget the instances of owners that went away."""
+        dead_owners = self._dead_owners
+        while dead_owners:
+            owner = dead_owners.pop()
+            for entry_key in list(self._of_owner.get(owner, ())):
+                self._remove(entry_key)
+
+    def _remove(self, entry_key: EntryKey) -> Optional[TrackedEntry]:
+        """Take an entry out of the graph."""
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            _discard_from(self._of_owner, entry_key[0], entry_key)
+            own_key = registration_dependency(entry.registration)
+            _discard_from(self._instances_of, own_key, entry_key)
+            for dependency in entry.dependencies:
+                _discard_from(self._dependents, dependency, entry_key)
+        return entry
+
+    def dependents(self, dependency: Hashable) -> list[Any]:
+        """The cached instances that directly read a dependency."""
+        with self._lock:
+            self._drop_dead_owners()
+            entry_keys = self._dependents.get(dependency, ())
+            return [self._entries[entry_key].instance for entry_key in entry_keys]
+
+    def changed(self, *dependencies: Hashable) -> list[Any]:
+        """Evict everything affected by the changed dependencies.
+
+        A changed registration also evicts its own cached instances.
+        Returns the evicted instances, including those evicted because
+        something they depended on was evicted.
+        """
+        with self._lock:
+            self._drop_dead_owners()
+            evicted = []
+            for dependency in dependencies:
+                if isinstance(dependency, Identity):
+                    for entry_key in list(self._instances_of.get(dependency, ())):
+                        entry = self._remove(entry_key)
+                        if entry is not None:
+                            entry.evict()
+                            evicted.append(entry.instance)
+            pending = list(dependencies)
+            while pending:
+                dependency = pending.pop()
+                if isinstance(dependency, Context) and dependency.attr is None:
+                    # The whole context changed, so did each attribute.
+                    keys: list[Hashable] = [
+                        key for key in self._dependents if isinstance(key, Context)
+                    ]
+                else:
+                    keys = list(expand_dependency(dependency))
+                for key in keys:
+                    for entry_key in list(self._dependents.get(key, ())):
+                        entry = self._remove(entry_key)
+                        if entry is None:
+                            continue
+                        entry.evict()
+                        evicted.append(entry.instance)
+                        pending.append(registration_dependency(entry.registration))
+            return evicted
@@ -0,0 +1,213 @@
+"""Test async resolution with ``aget`` and ``ainject_callable``."""
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Annotated
+
+import pytest
+from hopscotch import Registry
+from hopscotch.fixtures.dataklasses import Customer
+from hopscotch.fixtures.dataklasses import Greeter
+from hopscotch.fixtures.dataklasses import GreeterCustomer
+from hopscotch.fixtures.dataklasses import Greeting
+from hopscotch.registry import ainject_callable
+from hopscotch.operators import get
+from hopscotch.registry import Registration
+
+DELAY = 0.1
+
+
+class Service:
+    """A fake, in-process, async data source."""
+
+    name: str = "service"
+
+    def __init__(self, name: str) -> None:
+        """Remember what was fetched."""
+        self.name = name
+
+    @classmethod
+    async def __hopscotch_factory__(cls, registry: Registry) -> "Service":
+        """Fetch from the data source."""
+        await asyncio.sleep(DELAY)
+        return cls(cls.name)
+
+
+class Users(Service):
+    """A users service."""
+
+    name = "users"
+
+
+class Orders(Service):
+    """An orders service."""
+
+    name = "orders"
+
+
+class Products(Service):
+    """A products service."""
+
+    name = "products"
+
+
+class Reviews(Service):
+    """A reviews service."""
+
+    name = "reviews"
+
+
+class Prices(Service):
+    """A prices service."""
+
+    name = "prices"
+
+
+@dataclass()
+class Dashboard:
+    """A component with five I/O-bound dependencies."""
+
+    users: Users
+    orders: Orders
+    products: Products
+    reviews: Reviews
+    prices: Prices
+
+
+@dataclass(frozen=True)
+class Fetch:
+    """An async operator fetching an attribute of the context."""
+
+    attr: str
+
+    async def __call__(self, registry: Registry) -> object:
+        """Pretend to fetch it from somewhere."""
+        await asyncio.sleep(0)
+        return getattr(registry.context, self.attr)
+
+
+@dataclass()
+class Profile:
+    """A component using an async operator."""
+
+    first_name: Annotated[str, Fetch("first_name")]
+
+
+def make_registry() -> Registry:
+    """A registry with the fake services and the dashboard."""
+    registry = Registry()
+    for service in (Users, Orders, Products, Reviews, Prices):
+        registry.register(service, kind=service)
+    registry.register(Dashboard)
+    return registry
+
+
+def test_aget_concurrent() -> None:
+    """Independent dependencies are awaited concurrently."""
+    registry = make_registry()
+    start = perf_counter()
+    dashboard = asyncio.run(registry.aget(Dashboard))
+    elapsed = perf_counter() - start
+    assert dashboard.users.name == "users"
+    assert dashboard.prices.name == "prices"
+    assert elapsed < DELAY * 3
+
+
+def test_aget_async_factory() -> None:
+    """An async factory is awaited."""
+    registry = make_registry()
+    users = asyncio.run(registry.aget(Users))
+    assert users.name == "users"
+
+
+def test_aget_async_operator() -> None:
+    """An async operator is awaited."""
+    registry = Registry(context=Customer(first_name="Mary"))
+    registry.register(Profile)
+    profile = asyncio.run(registry.aget(Profile))
+    assert profile.first_name == "Mary"
+
+
+@dataclass()
+class Repo:
+    """A component depending on an async factory."""
+
+    users: Users
+
+
+@dataclass()
+class View:
+    """A component getting another with an operator."""
+
+    repo: Repo = get(Repo)
+    users: Users = get(Repo, attr="users")
+
+
+def test_aget_async_factory_behind_get() -> None:
+    """An async factory behind a ``Get`` operator is awaited."""
+    registry = make_registry()
+    registry.register(Repo)
+    registry.register(View)
+    view = asyncio.run(registry.aget(View))
+    assert view.repo.users.name == "users"
+    assert view.users.name == "users"
+
+
+def test_aget_sync() -> None:
+    """Plain components, operators, and props work as with ``get``."""
+    registry = Registry(context=Customer(first_name="Mary"))
+    registry.register(Greeting)
+    registry.register(GreeterCustomer)
+    greeter_customer = asyncio.run(registry.aget(GreeterCustomer))
+    assert greeter_customer.customer.first_name == "Mary"
+    greeting = asyncio.run(registry.aget(Greeting, salutation="Hi"))
+    assert greeting.salutation == "Hi"
+    registry.register(Greeter)
+    greeter = asyncio.run(registry.aget(Greeter))
+    assert greeter.greeting.salutation == "Hello"
+
+
+def test_aget_missing() -> None:
+    """Asking for an unregistered kind is a lookup error."""
+    registry = Registry()
+    with pytest.raises(LookupError):
+        asyncio.run(registry.aget(Greeting))
+
+
+def test_aget_lifetime() -> None:
+    """A scoped instance is constructed once, even when asked concurrently."""
+    registry = Registry()
+    registry.register(Users, kind=Users, lifetime="registry")
+
+    async def get_twice() -> tuple[Users, Users]:
+        return await asyncio.gather(registry.aget(Users), registry.aget(Users))
+
+    first, second = asyncio.run(get_twice())
+    assert first is second
+    assert registry.get(Users) is first
+
+
+def test_aget_tracking() -> None:
+    """Reads made concurrently are still tracked."""
+    registry = Registry(
+        context=Customer(first_name="Mary"),
+        track_dependencies=True,
+    )
+    registry.register(Profile, lifetime="registry")
+    profile = asyncio.run(registry.aget(Profile))
+    assert registry.changed(Fetch("first_name")) == [profile]
+
+
+def test_ainject_callable_no_registry() -> None:
+    """Without a registry, unregistered dependencies are constructed."""
+    registration = Registration(Greeter)
+    greeter = asyncio.run(ainject_callable(registration))
+    assert greeter.greeting.salutation == "Hello"
+
+
+def test_ainject_callable_operator_error() -> None:
+    """Operator errors propagate as with ``inject_callable``."""
+    registration = Registration(GreeterCustomer)
+    with pytest.raises(ValueError) as exc:
+        asyncio.run(ainject_callable(registration, registry=Registry()))
+    assert exc.value.args[0] == "No context on registry"
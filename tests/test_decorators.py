@@ -16,6 +16,8 @@ from hopscotch.fixtures.dataklasses import FrenchCustomer
 from hopscotch.fixtures.dataklasses import Greeter
 from hopscotch.fixtures.dataklasses import GreeterCustomer
 from hopscotch.fixtures.dataklasses import GreeterFrenchCustomer
+from hopscotch.registry import IsNoneType
+from hopscotch.registry import Provenance
 
 
 class View:
@@ -61,6 +63,20 @@ class MyConfig(View):
     title: str = "My Config"
 
 
+class Service:
+    """A marker for an example service built once per root registry."""
+
+    title: str
+
+
+@injectable(Service, lifetime="root")
+@dataclass
+class MyService(Service):
+    """An example service."""
+
+    title: str = "My Service"
+
+
 def test_injectable_no_context() -> None:
     """The decorator and its registration do not care about context."""
     registry = Registry()
@@ -114,3 +130,46 @@ def test_custom_singleton_decorator() -> None:
     assert "My Config" == impl.title
     result = cast(MyConfig, registry.get(Config))
     assert "My Config" == result.title
+
+
+def test_injectable_lifetime() -> None:
+    """The decorator can give a lifetime to the registration."""
+    registry = Registry()
+    registry.scan()
+    child = Registry(parent=registry)
+    service = child.get(Service)
+    assert "My Service" == service.title
+    assert registry.get(Service) is service
+
+
+def test_scan_twice() -> None:
+    """Scanning again replaces the registrations rather than adding more."""
+    registry = Registry()
+    registry.scan(dataklasses)
+    greeters = registry.registrations[Greeter]["classes"][IsNoneType]
+    assert greeters[0].provenance == Provenance(
+        "hopscotch.fixtures.dataklasses", "Greeter", "injectable"
+    )
+    registry.scan(dataklasses)
+    # Overlapping packages are no different.
+    registry.scan("hopscotch.fixtures")
+    rescanned = registry.registrations[Greeter]["classes"][IsNoneType]
+    assert len(rescanned) == 1
+    assert rescanned[0] is not greeters[0]
+
+    # Unless duplicates are allowed.
+    registry = Registry(allow_duplicates=True)
+    registry.scan(dataklasses)
+    registry.scan(dataklasses)
+    assert len(registry.registrations[Greeter]["classes"][IsNoneType]) == 2
+
+
+def test_scan_twice_singleton() -> None:
+    """A singleton decorator's instance is replaced by the new one."""
+    registry = Registry()
+    registry.scan()
+    first = registry.get(Config)
+    registry.scan()
+    (singleton,) = registry.registrations[Config]["singletons"][IsNoneType]
+    assert singleton.implementation is not first
+    assert registry.get(Config) is singleton.implementation
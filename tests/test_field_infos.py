@@ -244,3 +244,52 @@ def test_dataclass_field_operator() -> None:
     assert isinstance(operator, Get)
     assert operator.lookup_key == Customer
     assert operator.attr == "first_name"
+
+
+def test_field_infos_cache_shared() -> None:
+    """The same target is introspected once across registrations."""
+    from dataclasses import dataclass
+
+    from hopscotch.field_infos import field_infos_cache
+    from hopscotch.field_infos import get_field_infos
+
+    @dataclass()
+    class Heading:
+        title: str = "Heading"
+
+    misses = field_infos_cache.misses
+    first = get_field_infos(Heading)
+    r1, r2 = Registry(), Registry()
+    r1.register(Heading)
+    r2.register(Heading)
+    assert field_infos_cache.misses == misses + 1
+    assert r1.registrations[Heading]["classes"]
+    assert get_field_infos(Heading) is first
+
+    # Explicit invalidation forces introspection again
+    field_infos_cache.invalidate(Heading)
+    assert get_field_infos(Heading) is not first
+    assert field_infos_cache.misses == misses + 2
+
+
+def test_field_infos_cache_weak() -> None:
+    """Targets that go away drop out of the cache."""
+    import gc
+    from dataclasses import dataclass
+
+    from hopscotch.field_infos import FieldInfosCache
+
+    cache = FieldInfosCache()
+
+    @dataclass()
+    class Heading:
+        title: str = "Heading"
+
+    cache.get(Heading)
+    cache.get(Heading)
+    assert cache.info() == (1, 1, 1)
+    del Heading
+    gc.collect()
+    assert cache.info().size == 0
+    cache.clear()
+    assert cache.info() == (0, 0, 0)
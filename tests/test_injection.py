@@ -186,3 +186,43 @@ def test_hopscotch_factory() -> None:
     registry.register(GreetingFactory)
     result: GreetingFactory = inject_callable(r, registry=registry)
     assert result.salutation == "Hi From Factory"
+
+
+def test_injection_plan_cached() -> None:
+    """A registration compiles its injection plan once."""
+    registration = Registration(GreeterKind)
+    plan = registration.plan
+    assert registration.plan is plan
+    assert plan.factory is None
+    field_names = [field_name for field_name, _ in plan.field_resolvers]
+    assert field_names == [fi.field_name for fi in registration.field_infos]
+
+
+def test_injection_plan_factory() -> None:
+    """The plan remembers the ``__hopscotch_factory__``."""
+    registration = Registration(GreetingFactory)
+    assert registration.plan.factory == GreetingFactory.__hopscotch_factory__
+
+
+def test_injection_plan_props_none_uses_default() -> None:
+    """A prop passed as ``None`` still falls back to the default."""
+    registration = Registration(Greeting)
+    result: Greeting = inject_callable(registration, props={"salutation": None})
+    assert result.salutation == "Hello"
+
+
+def test_unregistered_dependency_registration_reused() -> None:
+    """Unregistered dependencies share one registration, with or without registry."""
+    from hopscotch.registry import get_unregistered_registration
+
+    registration = get_unregistered_registration(named_tuples.Greeting)
+    assert get_unregistered_registration(named_tuples.Greeting) is registration
+    plan = registration.plan
+
+    # Used without a registry...
+    result: named_tuples.Greeter = inject_callable(Registration(named_tuples.Greeter))
+    assert result.greeting.salutation == "Hello"
+    # ...and as a fallback from a registry that doesn't have it.
+    result = inject_callable(Registration(named_tuples.Greeter), registry=Registry())
+    assert result.greeting.salutation == "Hello"
+    assert get_unregistered_registration(named_tuples.Greeting).plan is plan
@@ -0,0 +1,271 @@
+"""Test writing a manifest of a scan and registering from it lazily."""
+import json
+import sys
+from pathlib import Path
+from threading import Thread
+from typing import Iterator
+
+import pytest
+from hopscotch import Registry
+from hopscotch.fixtures import dataklasses
+from hopscotch.fixtures.dataklasses import Customer
+from hopscotch.fixtures.dataklasses import Greeter
+from hopscotch.fixtures.dataklasses import Greeting
+from hopscotch.manifest import main
+from hopscotch.manifest import scan_to_manifest
+from hopscotch.persistence import import_target
+from hopscotch.persistence import read_manifest
+from hopscotch.persistence import write_manifest
+from hopscotch.registry import IsNoneType
+
+KINDS = """
+from hopscotch import injectable
+
+class Greeting:
+    salutation = "Hello"
+
+class Config:
+    title = "Config"
+
+class config(injectable):
+    kind = Config
+    is_singleton = True
+"""
+
+HELLO = """
+from hopscotch import injectable
+from .kinds import Greeting
+
+@injectable(Greeting)
+class Hello(Greeting):
+    pass
+"""
+
+HOLA = """
+from hopscotch import injectable
+from .kinds import Greeting
+
+@injectable(Greeting, context=Greeting, lifetime="root")
+class Hola(Greeting):
+    salutation = "Hola"
+"""
+
+SITE_CONFIG = """
+from .kinds import Config, config
+
+@config()
+class SiteConfig(Config):
+    title = "Site"
+"""
+
+NESTED_INIT = """
+from hopscotch import Registry
+
+registry = Registry()
+"""
+
+NESTED_KINDS = """
+class Greeting:
+    salutation = "Hello"
+
+class Greeter:
+    salutation = "Hello"
+"""
+
+NESTED_FRENCH = """
+from .kinds import Greeting
+
+class French(Greeting):
+    salutation = "Bonjour"
+"""
+
+NESTED_GREETER = """
+from . import registry
+from .kinds import Greeter, Greeting
+
+# Importing this module loads another lazy registration.
+SALUTATION = registry.get(Greeting).salutation
+
+class FrenchGreeter(Greeter):
+    salutation = SALUTATION
+"""
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> Iterator[Path]:
+    """Make an importable package of components, forgotten afterwards."""
+    root = tmp_path / "manifest_components"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "kinds.py").write_text(KINDS)
+    (root / "hello.py").write_text(HELLO)
+    (root / "hola.py").write_text(HOLA)
+    (root / "site_config.py").write_text(SITE_CONFIG)
+    sys.path.insert(0, str(tmp_path))
+    yield root
+    sys.path.remove(str(tmp_path))
+    for module_name in list(sys.modules):
+        if module_name.split(".")[0] == "manifest_components":
+            del sys.modules[module_name]
+
+
+@pytest.fixture
+def nested_package(tmp_path: Path) -> Iterator[Path]:
+    """Make a package whose modules look things up when imported."""
+    root = tmp_path / "nested_components"
+    root.mkdir()
+    (root / "__init__.py").write_text(NESTED_INIT)
+    (root / "kinds.py").write_text(NESTED_KINDS)
+    (root / "french.py").write_text(NESTED_FRENCH)
+    (root / "greeter.py").write_text(NESTED_GREETER)
+    sys.path.insert(0, str(tmp_path))
+    yield root
+    sys.path.remove(str(tmp_path))
+    for module_name in list(sys.modules):
+        if module_name.split(".")[0] == "nested_components":
+            del sys.modules[module_name]
+
+
+def forget_modules() -> None:
+    """Act like a new process, where nothing was imported yet."""
+    for module_name in list(sys.modules):
+        if module_name.startswith("manifest_components."):
+            del sys.modules[module_name]
+
+
+def test_import_target() -> None:
+    """Dotted names point at modules and what's in them."""
+    assert import_target("hopscotch.fixtures.dataklasses:Greeter") is Greeter
+    assert import_target("hopscotch.fixtures.dataklasses:") is dataklasses
+    with pytest.raises(AttributeError):
+        import_target("hopscotch.fixtures.dataklasses:Missing")
+
+
+def test_make_manifest() -> None:
+    """List registrations by dotted name, in registration order."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.register(Greeter, context=Customer, lifetime="root")
+    assert registry.make_manifest() == [
+        {
+            "kind": "hopscotch.fixtures.dataklasses:Greeting",
+            "context": None,
+            "implementation": "hopscotch.fixtures.dataklasses:Greeting",
+            "is_singleton": False,
+            "lifetime": "transient",
+            "memoize": False,
+            "decorator": None,
+        },
+        {
+            "kind": "hopscotch.fixtures.dataklasses:Greeter",
+            "context": "hopscotch.fixtures.dataklasses:Customer",
+            "implementation": "hopscotch.fixtures.dataklasses:Greeter",
+            "is_singleton": False,
+            "lifetime": "root",
+            "memoize": False,
+            "decorator": None,
+        },
+    ]
+
+
+def test_make_manifest_without_names() -> None:
+    """Registrations that can't be imported by name can't be listed."""
+
+    class Local:
+        pass
+
+    registry = Registry()
+    registry.register(Local)
+    with pytest.raises(ValueError) as exc:
+        registry.make_manifest()
+    assert exc.value.args[0].endswith("no name for kind")
+
+
+def test_load_manifest_imports_on_first_use(package: Path, tmp_path: Path) -> None:
+    """Only the implementations lookups choose get imported."""
+    path = tmp_path / "manifest.json"
+    assert scan_to_manifest("manifest_components", path) == 3
+    forget_modules()
+
+    registry = Registry()
+    registry.load_manifest(path)
+    assert "manifest_components.kinds" in sys.modules
+    assert "manifest_components.hello" not in sys.modules
+    assert "manifest_components.hola" not in sys.modules
+
+    config = import_target("manifest_components.kinds:Config")
+    greeting = import_target("manifest_components.kinds:Greeting")
+
+    assert registry.get(greeting).salutation == "Hello"
+    assert "manifest_components.hello" in sys.modules
+    assert "manifest_components.hola" not in sys.modules
+
+    hola = registry.get(greeting, context=greeting())
+    assert hola.salutation == "Hola"
+    assert registry.get(greeting, context=greeting()) is hola
+    # The singleton decorator's instance is made again.
+    assert registry.get(config).title == "Site"
+
+    # Written again from the loaded registrations, it's the same.
+    assert registry.make_manifest() == read_manifest(path)
+
+
+def test_load_manifest_matches_scan(package: Path, tmp_path: Path) -> None:
+    """The loaded registrations are where the scan put them."""
+    path = tmp_path / "manifest.json"
+    scan_to_manifest("manifest_components", path)
+    scanned = Registry()
+    scanned.scan("manifest_components")
+    loaded = Registry()
+    loaded.load_manifest(path)
+    for kind, kind_groups in scanned.registrations.items():
+        for s_or_c in ("singletons", "classes"):
+            group = kind_groups[s_or_c]
+            loaded_group = loaded.registrations[kind][s_or_c]
+            assert group.keys() == loaded_group.keys()
+    greeting = import_target("manifest_components.kinds:Greeting")
+    registration = loaded.registrations[greeting]["classes"][IsNoneType][0]
+    assert not registration.is_loaded
+    assert registration.import_path == "manifest_components.hello:Hello"
+
+
+def test_load_manifest_committed(tmp_path: Path) -> None:
+    """A committed registry doesn't take a manifest."""
+    path = tmp_path / "manifest.json"
+    write_manifest([], path)
+    registry = Registry()
+    registry.commit()
+    with pytest.raises(ValueError):
+        registry.load_manifest(path)
+    registry.reopen()
+    registry.load_manifest(path)
+
+
+def test_main(
+    package: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The command line scans a package into a manifest file."""
+    path = tmp_path / "manifest.json"
+    assert main(["manifest_components", str(path)]) == 0
+    assert capsys.readouterr().out == f"Wrote 3 registrations to {path}\n"
+    assert len(json.loads(path.read_text())) == 3
+    assert main([]) == 2
+
+
+def test_load_imports_nested_lazy_registration(nested_package: Path) -> None:
+    """A module that loads another registration when imported doesn't hang."""
+    registry = import_target("nested_components:registry")
+    greeting = import_target("nested_components.kinds:Greeting")
+    greeter = import_target("nested_components.kinds:Greeter")
+    registry.register_lazy("nested_components.french:French", kind=greeting)
+    registry.register_lazy("nested_components.greeter:FrenchGreeter", kind=greeter)
+    salutations: list[str] = []
+
+    def lookup() -> None:
+        salutations.append(registry.get(greeter).salutation)
+
+    thread = Thread(target=lookup, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert salutations == ["Bonjour"]
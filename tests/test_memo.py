@@ -0,0 +1,127 @@
+"""Test remembering immutable components by their inputs."""
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import pytest
+from hopscotch import Registry
+from hopscotch.fixtures.dataklasses import Customer
+from hopscotch.fixtures.dataklasses import Greeting
+from hopscotch.memo import Identity
+from hopscotch.memo import is_immutable_target
+from hopscotch.memo import make_memo_key
+from hopscotch.memo import Memo
+from hopscotch.operators import context
+
+
+@dataclass(frozen=True)
+class Breadcrumb:
+    """An immutable component."""
+
+    title: str = "Home"
+
+
+@dataclass(frozen=True)
+class Crumb:
+    """An immutable component with a number."""
+
+    n: float = 0
+
+
+class Sidebar(NamedTuple):
+    """An immutable ``NamedTuple`` component."""
+
+    title: str = "Sidebar"
+
+
+@dataclass(frozen=True)
+class CustomerBadge:
+    """An immutable component with a mutable dependency."""
+
+    customer: Customer = context()
+
+
+def test_is_immutable_target() -> None:
+    """Frozen dataclasses and ``NamedTuple`` classes are immutable."""
+    assert is_immutable_target(Breadcrumb)
+    assert is_immutable_target(Sidebar)
+    assert not is_immutable_target(Greeting)
+    assert not is_immutable_target(tuple)
+    assert not is_immutable_target(Breadcrumb())
+
+
+def test_make_memo_key() -> None:
+    """Hashable values key by value, others by identity."""
+    customer = Customer(first_name="Mary")
+    key = make_memo_key({"title": "Home", "customer": customer})
+    assert key == (("title", (str, "Home")), ("customer", Identity(customer)))
+    other_customer = Customer(first_name="Mary")
+    assert key != make_memo_key({"title": "Home", "customer": other_customer})
+
+    # Equal values of different types don't share a key.
+    assert make_memo_key({"n": 1}) != make_memo_key({"n": True})
+    assert make_memo_key({"n": 1}) != make_memo_key({"n": 1.0})
+
+
+def test_memo_lru() -> None:
+    """The least recently used instance is evicted first."""
+    memo = Memo(maxsize=2)
+    memo.set((("n", 1),), "one")
+    memo.set((("n", 2),), "two")
+    assert memo.get((("n", 1),)) == "one"
+    memo.set((("n", 3),), "three")
+    assert memo.get((("n", 2),)) is None
+    assert memo.get((("n", 1),)) == "one"
+    assert memo.info() == (2, 1, 2)
+    memo.clear()
+    assert memo.info().size == 0
+
+
+def test_registry_memoize() -> None:
+    """The same inputs give back the same instance."""
+    registry = Registry()
+    registry.register(Breadcrumb, memoize=True)
+    breadcrumb = registry.get(Breadcrumb)
+    assert registry.get(Breadcrumb) is breadcrumb
+    assert registry.get(Breadcrumb, title="Home") is breadcrumb
+    about = registry.get(Breadcrumb, title="About")
+    assert about.title == "About"
+    assert registry.get(Breadcrumb, title="About") is about
+
+
+def test_registry_memoize_by_type() -> None:
+    """Equal inputs of different types give back different instances."""
+    registry = Registry()
+    registry.register(Crumb, memoize=True)
+    crumb = registry.get(Crumb, n=1)
+    assert registry.get(Crumb, n=True).n is True
+    assert repr(registry.get(Crumb, n=1.0).n) == "1.0"
+    assert registry.get(Crumb, n=1) is crumb
+
+
+def test_registry_memoize_namedtuple_maxsize() -> None:
+    """A ``NamedTuple`` can be memoized with a size of memo."""
+    registry = Registry()
+    registry.register(Sidebar, kind=Sidebar, memoize=1)
+    sidebar = registry.get(Sidebar)
+    registry.get(Sidebar, title="Other")
+    assert registry.get(Sidebar) is not sidebar
+
+
+def test_registry_memoize_dependency_identity() -> None:
+    """Unhashable dependencies are part of the key by identity."""
+    registry = Registry()
+    registry.register(CustomerBadge, memoize=True)
+    mary = Registry(parent=registry, context=Customer(first_name="Mary"))
+    fred = Registry(parent=registry, context=Customer(first_name="Fred"))
+    badge = mary.get(CustomerBadge)
+    assert mary.get(CustomerBadge) is badge
+    assert fred.get(CustomerBadge).customer.first_name == "Fred"
+
+
+def test_registry_memoize_mutable() -> None:
+    """Only immutable components can be memoized."""
+    registry = Registry()
+    with pytest.raises(ValueError) as exc:
+        registry.register(Greeting, memoize=True)
+    expected = "Cannot memoize 'Greeting', not a frozen dataclass or NamedTuple"
+    assert str(exc.value) == expected
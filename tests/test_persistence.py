@@ -0,0 +1,148 @@
+"""Test remembering field infos on disk."""
+import sys
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+
+from hopscotch.field_infos import field_infos_cache
+from hopscotch.field_infos import FieldInfosCache
+from hopscotch.field_infos import get_field_infos
+from hopscotch.fixtures.dataklasses import Greeter
+from hopscotch.fixtures.dataklasses import GreeterFirstName
+from hopscotch.persistence import FieldInfosStore
+from hopscotch.persistence import get_module_fingerprint
+from hopscotch.persistence import get_target_key
+
+
+def test_get_target_key() -> None:
+    """Module-level targets have a key, local ones don't."""
+
+    @dataclass()
+    class Local:
+        pass
+
+    assert get_target_key(Greeter) == "hopscotch.fixtures.dataklasses:Greeter"
+    assert get_target_key(Local) is None
+
+
+def test_get_module_fingerprint() -> None:
+    """Only modules with a file get a fingerprint."""
+    assert get_module_fingerprint("hopscotch.fixtures.dataklasses")
+    assert get_module_fingerprint("sys") is None
+    assert get_module_fingerprint("not.imported") is None
+
+
+def test_store_round_trip(tmp_path: Path) -> None:
+    """Field infos saved by one store are loaded by the next."""
+    path = tmp_path / "field_infos.pickle"
+    store = FieldInfosStore(path)
+    assert store.get(GreeterFirstName) is None
+    store.set(GreeterFirstName, get_field_infos(GreeterFirstName))
+    store.save()
+
+    store = FieldInfosStore(path)
+    assert store.get(GreeterFirstName) == get_field_infos(GreeterFirstName)
+    assert (store.hits, store.misses) == (1, 0)
+
+
+def test_store_stale_fingerprint(tmp_path: Path) -> None:
+    """A changed module file means stored field infos are ignored."""
+    store = FieldInfosStore(tmp_path / "field_infos.pickle")
+    store.set(Greeter, get_field_infos(Greeter))
+    key = get_target_key(Greeter)
+    assert key is not None
+    (fingerprint, *bases), data = store.entries[key]
+    assert fingerprint is not None
+    mtime, size = fingerprint
+    store.entries[key] = (((mtime - 1, size), *bases), data)
+    assert store.get(Greeter) is None
+
+
+BASE = """\
+from dataclasses import dataclass
+
+
+@dataclass()
+class Base:
+    a: str = "a"
+"""
+
+CHILD = """\
+from dataclasses import dataclass
+
+from .base import Base
+
+
+@dataclass()
+class Child(Base):
+    c: str = "c"
+"""
+
+
+def test_store_stale_base_module(tmp_path: Path) -> None:
+    """A changed module of a base class means stored field infos are ignored."""
+    package = tmp_path / "stored_components"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "base.py").write_text(BASE)
+    (package / "child.py").write_text(CHILD)
+    path = tmp_path / "field_infos.pickle"
+    sys.path.insert(0, str(tmp_path))
+    try:
+        child = import_module("stored_components.child").Child
+        store = FieldInfosStore(path)
+        store.set(child, get_field_infos(child))
+        store.save()
+
+        (package / "base.py").write_text(BASE + '    b: str = "b"\n')
+        for module_name in ("stored_components.child", "stored_components.base"):
+            del sys.modules[module_name]
+        child = import_module("stored_components.child").Child
+        store = FieldInfosStore(path)
+        assert store.get(child) is None
+        field_names = [fi.field_name for fi in get_field_infos(child)]
+        assert field_names == ["a", "b", "c"]
+    finally:
+        sys.path.remove(str(tmp_path))
+        for module_name in list(sys.modules):
+            if module_name.split(".")[0] == "stored_components":
+                del sys.modules[module_name]
+
+
+def test_store_skips_local_targets(tmp_path: Path) -> None:
+    """Targets that can't be found by name aren't stored."""
+
+    @dataclass()
+    class Local:
+        title: str = "Local"
+
+    store = FieldInfosStore(tmp_path / "field_infos.pickle")
+    store.set(Local, get_field_infos(Local))
+    assert store.entries == {}
+    store.save()
+    assert not store.path.exists()
+
+
+def test_store_backs_cache(tmp_path: Path) -> None:
+    """A cache with a store fills it, and later uses it instead of introspecting."""
+    path = tmp_path / "field_infos.pickle"
+    cache = FieldInfosCache()
+    cache.store = FieldInfosStore(path)
+    field_infos = cache.get(Greeter)
+    assert cache.store.misses == 1
+    cache.store.save()
+
+    cache = FieldInfosCache()
+    cache.store = FieldInfosStore(path)
+    assert cache.get(Greeter) == field_infos
+    assert cache.store.hits == 1
+
+
+def test_store_context_manager(tmp_path: Path) -> None:
+    """The store is used by the process-wide cache inside the block."""
+    path = tmp_path / "field_infos.pickle"
+    with FieldInfosStore(path) as store:
+        assert field_infos_cache.store is store
+        store.set(Greeter, get_field_infos(Greeter))
+    assert field_infos_cache.store is None
+    assert path.exists()
@@ -1,4 +1,7 @@
 """Test the registry implementation and helpers."""
+import sys
+from abc import ABC
+from abc import abstractmethod
 from dataclasses import dataclass
 from typing import Optional
 
@@ -13,8 +16,13 @@ from hopscotch.fixtures.dataklasses import GreeterFirstName
 from hopscotch.fixtures.dataklasses import GreeterFrenchCustomer
 from hopscotch.fixtures.dataklasses import Greeting
 from hopscotch.operators import context
+from hopscotch.operators import get
+from hopscotch.registry import Candidates
 from hopscotch.registry import IsNoneType
+from hopscotch.registry import make_candidates
+from hopscotch.registry import NOT_FOUND
 from hopscotch.registry import Registration
+from hopscotch.registry import remove_from_kind_groups
 
 
 class DummyScan:
@@ -340,7 +348,7 @@ def test_register_class_with_context() -> None:
     registration = registrations[0]
     assert AnotherGreeting == registration.implementation
     gs = registry.registrations[Greeting]
-    assert gs["classes"][IsNoneType] == []
+    assert IsNoneType not in gs["classes"]
     first = gs["classes"][FrenchCustomer][0]
     assert first.implementation is AnotherGreeting
     assert first.kind is None
@@ -450,6 +458,33 @@ def test_nested_registry_match_child() -> None:
     assert "Child" == result.customer.first_name
 
 
+def test_find() -> None:
+    """``find`` returns ``NOT_FOUND`` where ``get`` raises."""
+    from hopscotch.registry import NOT_FOUND
+
+    registry = Registry()
+    registry.register(Greeting)
+    assert registry.find(Greeting).salutation == "Hello"
+    assert registry.find(Greeting, salutation="Hi").salutation == "Hi"
+    assert registry.find(Greeter) is NOT_FOUND
+    with pytest.raises(LookupError) as exc:
+        registry.get(Greeter)
+    assert exc.value.args[0] == "No kind 'Greeter' in registry"
+
+
+def test_injection_does_not_raise_on_miss() -> None:
+    """Injecting an unregistered dependency doesn't go through ``get``."""
+
+    class StrictRegistry(Registry):
+        def get(self, kind, context=None, **kwargs):  # type: ignore
+            raise AssertionError("get called during injection")
+
+    registry = StrictRegistry()
+    registry.register(Greeter)
+    greeter = registry.find(Greeter)
+    assert greeter.greeting.salutation == "Hello"
+
+
 def test_dependency_not_in_registry() -> None:
     """Injection can call the symbol if it isn't registered."""
     from hopscotch.fixtures import plain_classes
@@ -568,3 +603,729 @@ def test_registry_hopscotch_setup() -> None:
     registry.setup(hopscotch_setup)
     my_config = registry.get(MyConfig)
     assert my_config.site_title == "My Configuration"
+
+
+def test_resolution_cache_hits_and_misses() -> None:
+    """Repeated lookups are answered from the resolution cache."""
+    registry = Registry()
+    registry.register(AnotherGreeting)
+    assert registry.cache_info() == (0, 0, 0)
+
+    first = registry.get_best_match(Greeting)
+    second = registry.get_best_match(Greeting)
+    assert first is second
+    assert registry.cache_info() == (1, 1, 1)
+
+    # A different context class is a different cache entry
+    registry.get_best_match(Greeting, context_class=Customer)
+    assert registry.cache_info() == (1, 2, 2)
+
+
+def test_resolution_cache_caches_misses() -> None:
+    """A lookup that finds nothing is remembered as well."""
+    registry = Registry()
+    assert registry.get_best_match(Greeting) is None
+    assert registry.get_best_match(Greeting) is None
+    assert registry.cache_info() == (1, 1, 1)
+
+
+def test_lookups_do_not_mutate() -> None:
+    """Looking up kinds nobody registered leaves the registry as it was."""
+    parent = Registry()
+    parent.register(Greeting)
+    child = Registry(parent=parent)
+    child.register(Customer(first_name="Child"))
+    assert child.get_best_match(Greeter) is None
+    assert child.get_best_match(Greeting, context_class=FrenchCustomer)
+    with pytest.raises(LookupError):
+        child.get(Greeter)
+    assert list(parent.registrations) == [Greeting]
+    assert list(child.registrations) == [Customer]
+    assert Greeter not in child._lineages
+
+
+def test_misses_bounded_memory() -> None:
+    """A million misses don't grow the registry or its caches."""
+    from hopscotch.registry import MISSES_MAXSIZE
+
+    def footprint(registry: Registry) -> int:
+        return sum(
+            sys.getsizeof(part)
+            for part in (
+                registry.registrations,
+                registry._cache,
+                registry._misses,
+                registry._lineages,
+            )
+        )
+
+    registry = Registry()
+    registry.register(Greeting)
+    for kind in range(MISSES_MAXSIZE):
+        registry.get_best_match(kind)  # type: ignore
+    full = footprint(registry)
+
+    for kind in range(1_000_000):
+        assert registry.get_best_match(kind) is None  # type: ignore
+        if kind % 1000 == 0:
+            assert footprint(registry) <= full
+
+    assert list(registry.registrations) == [Greeting]
+    assert registry.cache_info().size <= MISSES_MAXSIZE
+
+
+def test_resolution_cache_invalidated_by_register() -> None:
+    """A new registration empties the resolution cache."""
+    registry = Registry()
+    registry.register(Greeting)
+    assert registry.get(Greeting).salutation == "Hello"
+    registry.register(AnotherGreeting)
+    assert registry.cache_info().size == 0
+    assert registry.get(Greeting).salutation == "Another Hello"
+
+
+def test_resolution_cache_invalidated_by_parent_register() -> None:
+    """A registration in any ancestor empties descendant caches."""
+    grandparent = Registry()
+    grandparent.register(Greeting)
+    parent = Registry(parent=grandparent)
+    child = Registry(parent=parent)
+    # Give the child registrations, thus a cache, of its own
+    child.register(Customer(first_name="Child"))
+    assert child.get(Greeting).salutation == "Hello"
+    assert child.cache_info().size == 1
+
+    grandparent.register(AnotherGreeting)
+    assert child.cache_info().size == 0
+    assert child.get(Greeting).salutation == "Another Hello"
+
+
+def test_commit_compiles_dispatch_table() -> None:
+    """A committed registry answers registered contexts from its table."""
+    parent = Registry()
+    parent.register(Greeter)
+    registry = Registry(parent=parent)
+    registry.register(Greeting)
+    registry.register(AnotherGreeting, context=FrenchCustomer)
+    registry.commit()
+    assert registry.is_committed
+
+    french_match = registry.get_best_match(Greeting, context_class=FrenchCustomer)
+    assert french_match and french_match.implementation is AnotherGreeting
+    greeting_match = registry.get_best_match(Greeting)
+    assert greeting_match and greeting_match.implementation is Greeting
+    # Inherited from the parent
+    greeter_match = registry.get_best_match(Greeter)
+    assert greeter_match and greeter_match.implementation is Greeter
+    # All answered from the table, not the resolution cache
+    assert registry.cache_info() == (0, 0, 0)
+
+    # Context classes not in the table still resolve, through the cache
+    @dataclass()
+    class ParisCustomer(FrenchCustomer):
+        pass
+
+    paris_match = registry.get_best_match(Greeting, context_class=ParisCustomer)
+    assert paris_match and paris_match.implementation is AnotherGreeting
+    assert registry.cache_info().misses == 1
+
+
+def test_commit_closes_registration() -> None:
+    """Registering into a committed registry needs a reopen."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.commit()
+    with pytest.raises(ValueError) as exc:
+        registry.register(AnotherGreeting)
+    expected = "Registry is committed, call reopen() before registering"
+    assert str(exc.value) == expected
+
+    registry.reopen()
+    assert not registry.is_committed
+    registry.register(AnotherGreeting)
+    assert registry.get(Greeting).salutation == "Another Hello"
+
+
+def test_commit_recompiles_when_parent_changes() -> None:
+    """A committed child picks up later registrations in its parent."""
+    parent = Registry()
+    parent.register(Greeting)
+    child = Registry(parent=parent)
+    child.commit()
+    assert child.get(Greeting).salutation == "Hello"
+    parent.register(AnotherGreeting)
+    assert child.get(Greeting).salutation == "Another Hello"
+
+
+def test_nearest_context_ancestor_wins() -> None:
+    """The nearest registered ancestor of the context class wins."""
+
+    @dataclass()
+    class Person:
+        first_name: str = "person"
+
+    @dataclass()
+    class Member(Person):
+        pass
+
+    @dataclass()
+    class GoldMember(Member):
+        pass
+
+    registry = Registry()
+    # Register the closer ancestor first, so order can't explain the result.
+    registry.register(Greeting(salutation="member"), context=Member)
+    registry.register(Greeting(salutation="person"), context=Person)
+    registry.register(Greeting(salutation="none"))
+    assert registry.get(Greeting, context=GoldMember()).salutation == "member"
+    assert registry.get(Greeting, context=Member()).salutation == "member"
+    assert registry.get(Greeting, context=Person()).salutation == "person"
+    assert registry.get(Greeting).salutation == "none"
+
+
+def test_virtual_subclass_context() -> None:
+    """Contexts registered with an ABC match it, after their MRO."""
+
+    class Page(ABC):
+        @abstractmethod
+        def render(self) -> str:
+            """Render the page."""
+
+    class Sized(ABC):
+        @abstractmethod
+        def __len__(self) -> int:
+            """The number of items."""
+
+        @classmethod
+        def __subclasshook__(cls, subclass: type) -> bool:
+            return hasattr(subclass, "__len__")
+
+    @dataclass()
+    class Doc:
+        title: str = "doc"
+
+    class Text(str):
+        pass
+
+    Page.register(Doc)
+    registry = Registry()
+    registry.register(AnotherGreeting, kind=Greeting, context=Page)
+    registry.register(Greeting(salutation="sized"), context=Sized)
+    registry.register(Greeting(salutation="text"), context=str)
+    registry.register(Greeting(salutation="none"))
+    assert registry.get(Greeting, context=Doc()).salutation == "Another Hello"
+    assert registry.get(Greeting, context=["a"]).salutation == "sized"
+    # The MRO comes first.
+    assert registry.get(Greeting, context=Text("a")).salutation == "text"
+    assert registry.get(Greeting, context=1).salutation == "none"
+    candidates = registry.iter_candidates(Greeting, Doc)
+    assert [r.implementation for r in candidates][0] is AnotherGreeting
+
+    # The ABC contexts are kept aside, and go when their registrations do.
+    kind_groups = registry.registrations[Greeting]
+    assert kind_groups["abcs"] == (Page, Sized)
+    page_registration = kind_groups["classes"][Page][0]
+    kind_groups = remove_from_kind_groups(kind_groups, {id(page_registration)})
+    assert kind_groups["abcs"] == (Sized,)
+
+
+def test_lineage_of_deep_chain() -> None:
+    """A deep chain resolves through a flat lineage of known kinds."""
+    root = Registry()
+    root.register(Greeting)
+    registries = [root]
+    for _ in range(5):
+        registries.append(Registry(parent=registries[-1]))
+    leaf = registries[-1]
+    assert leaf.get(Greeting).salutation == "Hello"
+    assert leaf._lineage(Greeting) == (root.registrations[Greeting],)
+    assert leaf._lineage(Customer) == ()
+
+    # A registration in the middle of the chain rebuilds the lineage
+    middle = registries[2]
+    middle.register(AnotherGreeting)
+    assert len(leaf._lineage(Greeting)) == 2
+    assert leaf.get(Greeting).salutation == "Another Hello"
+
+
+def test_lineage_nearest_registry_wins() -> None:
+    """A context-less match in a child beats a context match in a parent."""
+    parent = Registry(context=Customer(first_name="Fred"))
+    parent.register(Greeting(salutation="parent"), context=Customer)
+    child = Registry(parent=parent)
+    assert child.get(Greeting).salutation == "parent"
+    child.register(Greeting(salutation="child"))
+    assert child.get(Greeting).salutation == "child"
+
+
+def test_child_registry_overlay() -> None:
+    """A child with nothing registered shares the parent's answers."""
+    parent = Registry()
+    parent.register(Greeting)
+    child = Registry(parent=parent)
+    assert child.get(Greeting).salutation == "Hello"
+    assert "scanner" not in child.__dict__
+    assert child._registrations is None
+    assert child.cache_info() == (0, 0, 0)
+    assert parent.cache_info().misses == 1
+
+    # Registering gives the child answers of its own
+    child.register(Greeting(salutation="child"))
+    assert child.get(Greeting).salutation == "child"
+    assert child.cache_info().misses == 1
+
+
+def test_registration_lazy_field_infos(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A lazy registration introspects on first use, once, across threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from hopscotch import registry as registry_module
+    from hopscotch.field_infos import get_field_infos
+
+    calls = []
+
+    def counting_get_field_infos(target: object) -> object:
+        calls.append(target)
+        return get_field_infos(target)
+
+    monkeypatch.setattr(registry_module, "get_field_infos", counting_get_field_infos)
+    registration = Registration(implementation=Greeting, lazy=True)
+    assert calls == []
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: registration.field_infos, range(32)))
+    assert calls == [Greeting]
+    assert all(result is results[0] for result in results)
+
+
+def test_registry_lazy_introspection() -> None:
+    """A lazy registry defers introspection until injection."""
+    parent = Registry(lazy_introspection=True)
+    parent.register(GreeterCustomer, kind=Greeter)
+    registration = parent.registrations[Greeter]["classes"][IsNoneType][0]
+    assert registration._field_infos is None
+
+    # Children inherit the setting
+    child = Registry(parent=parent, context=Customer(first_name="Lazy"))
+    assert child.lazy_introspection
+    greeter = child.get(Greeter)
+    assert isinstance(greeter, GreeterCustomer)
+    assert greeter.customer.first_name == "Lazy"
+    assert registration._field_infos is not None
+
+
+def test_lifetime_transient() -> None:
+    """By default, classes are constructed on every ``get``."""
+    registry = Registry()
+    registry.register(Greeting)
+    assert registry.get(Greeting) is not registry.get(Greeting)
+
+
+def test_lifetime_registry() -> None:
+    """A registry lifetime is constructed once per registry asked."""
+    parent = Registry()
+    parent.register(Greeting, lifetime="registry")
+    child1 = Registry(parent=parent)
+    child2 = Registry(parent=parent)
+    greeting = child1.get(Greeting)
+    assert child1.get(Greeting) is greeting
+    assert child2.get(Greeting) is not greeting
+    assert parent.get(Greeting) is not greeting
+    # Props always mean a new instance
+    assert child1.get(Greeting, salutation="Props") is not greeting
+
+
+def test_lifetime_root() -> None:
+    """A root lifetime is constructed once, with the root registry."""
+
+    @dataclass()
+    class Config:
+        customer: Customer = context()
+
+    root = Registry(context=Customer(first_name="Root"))
+    root.register(Config, lifetime="root")
+    child1 = Registry(parent=root, context=Customer(first_name="Child1"))
+    child2 = Registry(parent=root, context=Customer(first_name="Child2"))
+    config = child1.get(Config)
+    assert config.customer.first_name == "Root"
+    assert child2.get(Config) is config
+    assert root.get(Config) is config
+
+
+def test_lifetime_root_in_child() -> None:
+    """A root lifetime is kept, and injected, where it is registered."""
+
+    @dataclass()
+    class Dep:
+        name: str = "default"
+
+    @dataclass()
+    class SpecialDep(Dep):
+        name: str = "special"
+
+    @dataclass()
+    class Service:
+        dep: Dep
+
+    root = Registry()
+    child = Registry(parent=root)
+    child.register(SpecialDep, kind=Dep)
+    child.register(Service, lifetime="root")
+    grandchild = Registry(parent=child)
+    service = grandchild.get(Service)
+    assert service.dep == SpecialDep()
+    assert child.get(Service) is service
+    assert [instance for _, instance in child._instances.values()] == [service]
+    assert root._instances == {}
+    assert grandchild._instances == {}
+
+
+def test_lifetime_new_registration() -> None:
+    """A later registration gets instances of its own."""
+    registry = Registry()
+    registry.register(Greeting, lifetime="registry")
+    greeting = registry.get(Greeting)
+    registry.register(AnotherGreeting, lifetime="registry")
+    another_greeting = registry.get(Greeting)
+    assert another_greeting is not greeting
+    assert registry.get(Greeting) is another_greeting
+
+
+def test_lifetime_unknown() -> None:
+    """Only the known lifetimes can be registered."""
+    registry = Registry()
+    with pytest.raises(ValueError) as exc:
+        registry.register(Greeting, lifetime="forever")  # type: ignore
+    assert str(exc.value) == "Unknown lifetime 'forever'"
+
+
+def test_get_batch_props() -> None:
+    """Construct a kind for each of many props, in order."""
+    registry = Registry()
+    registry.register(Greeting)
+    props = [{"salutation": "Hi"}, {"salutation": "Hey"}]
+    greetings = registry.get_batch(Greeting, props=props)
+    assert [greeting.salutation for greeting in greetings] == ["Hi", "Hey"]
+
+
+def test_get_batch_contexts() -> None:
+    """Each context gets the best match for its class."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.register(AnotherGreeting, context=FrenchCustomer)
+    registry.register(GreeterCustomer)
+    mary, marie = Customer(first_name="Mary"), FrenchCustomer(first_name="Marie")
+    greetings = registry.get_batch(Greeting, contexts=[mary, marie, mary])
+    salutations = [greeting.salutation for greeting in greetings]
+    assert salutations == ["Hello", "Another Hello", "Hello"]
+    greeters = registry.get_batch(GreeterCustomer, contexts=[mary, marie])
+    assert [greeter.customer for greeter in greeters] == [mary, marie]
+
+
+def test_get_batch_contexts_and_props() -> None:
+    """Contexts and props are paired up."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.register(AnotherGreeting, context=FrenchCustomer)
+    contexts = [Customer(first_name="Mary"), FrenchCustomer(first_name="Marie")]
+    props = [{"salutation": "Hi"}, {"salutation": "Salut"}]
+    greetings = registry.get_batch(Greeting, contexts=contexts, props=props)
+    assert [type(greeting) for greeting in greetings] == [Greeting, AnotherGreeting]
+    assert [greeting.salutation for greeting in greetings] == ["Hi", "Salut"]
+
+    with pytest.raises(ValueError):
+        registry.get_batch(Greeting, contexts=contexts, props=props[:1])
+    with pytest.raises(ValueError) as exc:
+        registry.get_batch(Greeting)
+    assert exc.value.args[0] == "Pass contexts, props, or both"
+
+
+def test_get_batch_shares_context_registry() -> None:
+    """Items for the same context share its registry lifetime instances."""
+    registry = Registry()
+    registry.register(GreeterCustomer, lifetime="registry")
+    mary, marie = Customer(first_name="Mary"), Customer(first_name="Marie")
+    first, second, third = registry.get_batch(
+        GreeterCustomer, contexts=[mary, marie, mary]
+    )
+    assert first is third
+    assert first is not second
+    assert second.customer is marie
+
+
+def test_iter_batch_lazy() -> None:
+    """Instances are constructed as they are iterated over."""
+    registry = Registry()
+    registry.register(Greeting)
+    props = iter([{"salutation": "Hi"}, {"salutation": "Hey"}])
+    greetings = registry.iter_batch(Greeting, props=props)
+    assert next(greetings).salutation == "Hi"
+    assert next(props) == {"salutation": "Hey"}
+    assert list(greetings) == []
+
+
+def test_get_batch_missing() -> None:
+    """A kind without a match fails as with ``get``."""
+    registry = Registry()
+    with pytest.raises(LookupError) as exc:
+        registry.get_batch(Greeting, props=[{}])
+    assert exc.value.args[0] == "No kind 'Greeting' in registry"
+
+
+def test_warmup() -> None:
+    """Resolve, introspect, and compile everything reachable up front."""
+    from hopscotch.fixtures import plain_classes
+
+    @dataclass()
+    class Page:
+        greeter: Greeter
+        plain: plain_classes.Greeting
+        customer_name: str = get(Customer, attr="first_name")
+
+    registry = Registry(lazy_introspection=True)
+    registry.register(Greeting)
+    registry.register(AnotherGreeting, context=FrenchCustomer)
+    registry.register(Greeter, lifetime="root")
+    registry.register(Customer(first_name="Mary"))
+    registry.register(Page)
+    page_registration = registry.registrations[Page]["classes"][IsNoneType][0]
+    assert page_registration._field_infos is None
+
+    report = registry.warmup(kinds=[Page])
+    # Page, Greeter, both Greetings, the Customer, and the plain class
+    assert report.registrations == 6
+    assert report.total >= report.resolve + report.introspect + report.compile
+    assert page_registration._plan is not None
+    assert registry.registrations[Greeting]["classes"][FrenchCustomer][0]._plan
+    # The root lifetime Greeter was constructed.
+    ((_, greeter),) = registry._instances.values()
+    assert registry.get(Greeter) is greeter
+
+    hits = registry.cache_info().hits
+    assert registry.get(Page).customer_name == "Mary"
+    assert registry.cache_info().hits > hits
+
+
+def test_warmup_skips_scoped_instances() -> None:
+    """Instances needing props or another context aren't constructed."""
+
+    @dataclass()
+    class Badge:
+        first_name: str = context(attr="first_name")
+
+    @dataclass()
+    class Heading:
+        title: str
+
+    registry = Registry()
+    registry.register(Badge, context=Customer, lifetime="registry")
+    registry.register(Heading, lifetime="registry")
+    report = registry.warmup()
+    assert report.registrations == 2
+    assert [r.implementation for r in report.skipped] == [Heading]
+    assert registry._instances == {}
+
+    # A registry with the context constructs it, for that context.
+    child = Registry(parent=registry, context=Customer(first_name="Mary"))
+    report = child.warmup()
+    assert [r.implementation for r in report.skipped] == [Heading]
+    ((_, badge),) = child._instances.values()
+    assert child.get(Badge) is badge
+    assert badge.first_name == "Mary"
+
+
+def test_warmup_contexts() -> None:
+    """Only resolve for the given contexts, classes or instances."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.register(AnotherGreeting, context=FrenchCustomer)
+    assert registry.warmup(contexts=[None]).registrations == 1
+    registry.cache_clear()
+    assert registry.warmup(contexts=[FrenchCustomer("marie")]).registrations == 1
+    assert registry.warmup().registrations == 2
+
+
+def test_register_many() -> None:
+    """Register several implementations, latest first as with ``register``."""
+    registry = Registry()
+    registry.register_many([Greeting, AnotherGreeting], kind=Greeting)
+    classes = registry.registrations[Greeting]["classes"][IsNoneType]
+    assert [r.implementation for r in classes] == [AnotherGreeting, Greeting]
+    assert registry.get(Greeting).salutation == "Another Hello"
+
+
+def test_bulk() -> None:
+    """Registrations in a bulk block are added once, at its end."""
+    registry = Registry()
+    registry.register(Greeting)
+    child = Registry(parent=registry)
+    assert child.get(Greeting).salutation == "Hello"
+    with registry.bulk():
+        registry.register(AnotherGreeting, kind=Greeting)
+        registry.register(AnotherGreeting, kind=Greeting, context=FrenchCustomer)
+        with registry.bulk():
+            registry.register(Customer(first_name="Mary"))
+        # Not visible yet, and the child's cached answer stays.
+        assert registry.get(Greeting).salutation == "Hello"
+        assert child.get(Greeting).salutation == "Hello"
+        assert registry.find(Customer) is registry.find(Customer)
+    assert child.get(Greeting).salutation == "Another Hello"
+    classes = registry.registrations[Greeting]["classes"]
+    assert [r.implementation for r in classes[IsNoneType]] == [
+        AnotherGreeting,
+        Greeting,
+    ]
+    assert registry.get(Customer).first_name == "Mary"
+    assert registry._bulk.pending is None
+
+
+def test_bulk_error() -> None:
+    """Registrations made before an error in the block are kept."""
+    registry = Registry()
+    with pytest.raises(ValueError):
+        with registry.bulk():
+            registry.register(Greeting)
+            registry.register(Greeting, lifetime="forever")  # type: ignore
+    assert registry.get(Greeting).salutation == "Hello"
+
+
+def test_register_dotted_name() -> None:
+    """A class registered by name is imported when first chosen."""
+    registry = Registry()
+    registry.register_lazy(
+        "hopscotch.fixtures.dataklasses:AnotherGreeting",
+        kind=Greeting,
+        context=FrenchCustomer,
+    )
+    registration = registry.registrations[Greeting]["classes"][FrenchCustomer][0]
+    assert not registration.is_loaded
+    assert registration.provenance is not None
+    location = registration.provenance.location
+    assert location is not None and location.startswith(__file__)
+    assert registry.find(Greeting) is NOT_FOUND
+    assert not registration.is_loaded
+
+    greeting = registry.get(Greeting, context=FrenchCustomer(first_name="Marie"))
+    assert greeting.salutation == "Another Hello"
+    assert registration.is_loaded
+    assert registration.implementation is AnotherGreeting
+    assert registration.field_infos
+
+
+def test_register_string_singleton() -> None:
+    """A plain string is a singleton, not a dotted name."""
+    registry = Registry()
+    registry.register("My Site", kind=str)
+    assert registry.get(str) == "My Site"
+
+
+@pytest.mark.parametrize(
+    "dotted_name",
+    ["hopscotch.fixtures.missing:Greeting", "hopscotch.fixtures.dataklasses:Nope"],
+)
+def test_register_dotted_name_import_error(dotted_name: str) -> None:
+    """Import errors say where the registration was made."""
+    registry = Registry()
+    registry.register_lazy(dotted_name, kind=Greeting)
+    with pytest.raises(ImportError) as exc:
+        registry.get(Greeting)
+    message = exc.value.args[0]
+    assert message.startswith(f"Cannot import {dotted_name!r} (from {__file__}:")
+    # Not cached, so it is tried again.
+    with pytest.raises(ImportError):
+        registry.get(Greeting)
+
+
+def test_register_dotted_name_not_a_class() -> None:
+    """A dotted name must name a class."""
+    registry = Registry()
+    registry.register_lazy("hopscotch.fixtures.dataklasses:dataclass", kind=Greeting)
+    with pytest.raises(TypeError) as exc:
+        registry.get(Greeting)
+    assert exc.value.args[0].endswith("is not a class")
+
+
+def test_register_duplicates() -> None:
+    """Registrations with the same provenance in one place replace."""
+    registry = Registry()
+    dotted_name = "hopscotch.fixtures.dataklasses:AnotherGreeting"
+    for _ in range(2):
+        registry.register_lazy(dotted_name, kind=Greeting)
+    with registry.bulk():
+        registry.register_lazy(dotted_name, kind=Greeting)
+        registry.register_lazy(dotted_name, kind=Greeting)
+    # Elsewhere is no duplicate.
+    registry.register_lazy(dotted_name, kind=Greeting, context=FrenchCustomer)
+    assert len(registry.registrations[Greeting]["classes"][IsNoneType]) == 1
+    assert len(registry.registrations[Greeting]["classes"][FrenchCustomer]) == 1
+
+    # Without a provenance, there's no telling.
+    registry.register(Greeting)
+    registry.register(Greeting)
+    assert len(registry.registrations[Greeting]["classes"][IsNoneType]) == 3
+
+
+def test_compact() -> None:
+    """Drop registrations that can never be chosen again."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.register(Greeting, lifetime="registry")
+    registry.get(Greeting)
+    registry.register(AnotherGreeting, kind=Greeting)
+    registry.register(Customer(first_name="Mary"))
+    child = Registry(parent=registry)
+    assert child.get(Greeting).salutation == "Another Hello"
+
+    assert registry.compact() == 2
+    assert registry._instances == {}
+    classes = registry.registrations[Greeting]["classes"][IsNoneType]
+    assert [r.implementation for r in classes] == [AnotherGreeting]
+    assert child.get(Greeting).salutation == "Another Hello"
+    assert registry.compact() == 0
+
+
+def test_candidates() -> None:
+    """Registrations for a context are linked, newest first."""
+    first = Registration(Greeting)
+    second = Registration(AnotherGreeting)
+    older = Candidates(first)
+    candidates = Candidates(second, older)
+    assert candidates.older is older
+    assert len(candidates) == 2
+    assert list(candidates) == [second, first]
+    assert list(reversed(candidates)) == [first, second]
+    assert candidates[0] is second
+    assert candidates[1] is first
+    assert candidates[-1] is first
+    assert make_candidates([second, first]).older.newest is first  # type: ignore
+    assert make_candidates([]) is None
+
+
+def test_register_shares_candidates() -> None:
+    """Registering in front keeps the older candidates as they were."""
+    registry = Registry()
+    registry.register(Greeting)
+    older = registry.registrations[Greeting]["classes"][IsNoneType]
+    registry.register(AnotherGreeting, kind=Greeting)
+    candidates = registry.registrations[Greeting]["classes"][IsNoneType]
+    assert candidates.older is older
+    assert len(older) == 1
+
+
+def test_iter_candidates() -> None:
+    """List everything that could be chosen, best first."""
+    registry = Registry()
+    registry.register(Greeting)
+    registry.register(AnotherGreeting, kind=Greeting, context=Customer)
+    registry.register(Greeting(salutation="Hi"))
+    child = Registry(parent=registry)
+    child.register(AnotherGreeting, kind=Greeting)
+    candidates = list(child.iter_candidates(Greeting, FrenchCustomer))
+    assert [type(c.implementation) for c in candidates[3:]] == [Greeting]
+    assert [c.implementation for c in candidates[:3]] == [
+        AnotherGreeting,
+        AnotherGreeting,
+        Greeting,
+    ]
+    assert candidates[0] is child.get_best_match(Greeting, FrenchCustomer)
+    assert len(list(child.iter_candidates(Greeting, allow_singletons=False))) == 2
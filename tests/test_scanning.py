@@ -0,0 +1,303 @@
+"""Test incremental scans, which skip unchanged modules."""
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from typing import cast
+from typing import Iterator
+from typing import Optional
+
+import pytest
+from hopscotch import Registry
+from hopscotch.persistence import import_target
+from hopscotch.registry import IsNoneType
+from hopscotch.scanning import find_importers
+from hopscotch.scanning import fingerprint
+from hopscotch.scanning import get_module_file
+from hopscotch.scanning import is_unchanged
+from hopscotch.scanning import ModuleScan
+
+KINDS = """
+class Greeting:
+    salutation = "Hello"
+"""
+
+HELLO = """
+from hopscotch import injectable
+from .kinds import Greeting
+
+@injectable(Greeting)
+class Hello(Greeting):
+    pass
+"""
+
+HOLA = """
+from hopscotch import injectable
+from .kinds import Greeting
+
+@injectable(Greeting)
+class Hola(Greeting):
+    salutation = "Hola"
+"""
+
+BONJOUR = """
+from hopscotch import injectable
+from .kinds import Greeting
+
+@injectable(Greeting)
+class Bonjour(Greeting):
+    salutation = "Bonjour"
+
+@injectable(Greeting, context=Greeting)
+class BonjourGreeting(Greeting):
+    salutation = "Bonjour again"
+"""
+
+GREETER = """
+from dataclasses import dataclass
+from hopscotch import injectable
+from .a import Hello
+
+@injectable()
+@dataclass()
+class Greeter:
+    greeting: Hello
+"""
+
+
+def write(path: Path, source: str, tick: int = 0) -> None:
+    """Write a module, with an mtime that moves forward between edits."""
+    path.write_text(source)
+    mtime_ns = path.stat().st_mtime_ns + tick * 10_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> Iterator[Path]:
+    """Make an importable package of components, forgotten afterwards."""
+    root = tmp_path / "incremental_components"
+    (root / "sub").mkdir(parents=True)
+    write(root / "__init__.py", "")
+    write(root / "kinds.py", KINDS)
+    write(root / "a.py", HELLO)
+    write(root / "b.py", HOLA)
+    write(root / "sub" / "__init__.py", "")
+    write(
+        root / "sub" / "c.py",
+        HOLA.replace("Hola", "Ciao").replace(".kinds", "..kinds"),
+    )
+    sys.path.insert(0, str(tmp_path))
+    yield root
+    sys.path.remove(str(tmp_path))
+    for module_name in list(sys.modules):
+        if module_name.split(".")[0] == "incremental_components":
+            del sys.modules[module_name]
+
+
+def name(target: Any) -> Optional[str]:
+    """The dotted name of a class, the same across imports."""
+    if target is None:
+        return None
+    return f"{target.__module__}:{target.__qualname__}"
+
+
+def snapshot(registry: Registry) -> dict[Optional[str], Any]:
+    """The registrations tree, by the dotted names of what's in it."""
+    return {
+        name(kind): {
+            s_or_c: {
+                name(this_context): [
+                    (name(r.implementation), name(r.kind), name(r.context), r.lifetime)
+                    for r in these_registrations
+                ]
+                for this_context, these_registrations in group.items()
+            }
+            for s_or_c, group in cast("dict[str, Any]", kind_groups).items()
+            if s_or_c != "abcs"
+        }
+        for kind, kind_groups in registry.registrations.items()
+    }
+
+
+def full_scan() -> Registry:
+    """Scan the package, as it is now, in a new registry and a fresh import."""
+    imported = {
+        module_name: sys.modules.pop(module_name)
+        for module_name in list(sys.modules)
+        if module_name.split(".")[0] == "incremental_components"
+    }
+    registry = Registry()
+    registry.scan("incremental_components")
+    # Forget the fresh import, for the incremental scan's to be used.
+    for module_name in list(sys.modules):
+        if module_name.split(".")[0] == "incremental_components":
+            del sys.modules[module_name]
+    sys.modules.update(imported)
+    return registry
+
+
+def test_fingerprint(tmp_path: Path) -> None:
+    """Only hash when mtime or size changed, and compare the hash."""
+    path = tmp_path / "module.py"
+    write(path, HELLO)
+    first = fingerprint(str(path))
+    assert first is not None
+    assert fingerprint(str(path), first) is first
+    assert fingerprint(None) is None
+    assert fingerprint(str(tmp_path / "missing.py")) is None
+
+    # Touched but not changed.
+    write(path, HELLO, tick=1)
+    touched = fingerprint(str(path), first)
+    assert touched is not None and touched != first
+    assert is_unchanged(ModuleScan(first, ()), touched)
+
+    write(path, HOLA, tick=2)
+    assert not is_unchanged(ModuleScan(first, ()), fingerprint(str(path), first))
+    assert not is_unchanged(None, first)
+    assert is_unchanged(ModuleScan(None, ()), None)
+
+
+def test_get_module_file() -> None:
+    """Modules without a source file have none."""
+    module_file = get_module_file("hopscotch.scanning")
+    assert module_file is not None and module_file.endswith("scanning.py")
+    assert get_module_file("sys") is None
+    assert get_module_file("hopscotch.missing") is None
+
+
+def test_find_importers() -> None:
+    """Modules holding what changed modules define, or the modules."""
+    changed = ModuleType("pkg.changed")
+    changed.Thing = type("Thing", (), {"__module__": "pkg.changed"})  # type: ignore
+    user = ModuleType("pkg.user")
+    user.Thing = changed.Thing  # type: ignore
+    user_of_user = ModuleType("pkg.user_of_user")
+    user_of_user.user = user  # type: ignore
+    package = ModuleType("pkg")
+    package.changed = changed  # type: ignore
+    other = ModuleType("pkg.other")
+    other.name = "pkg.changed"  # type: ignore
+    candidates = {
+        module.__name__: module for module in (user, user_of_user, package, other)
+    }
+    found = find_importers(candidates, {"pkg.changed"})
+    assert found == {"pkg.user", "pkg.user_of_user"}
+
+
+def test_incremental_scan_matches_full_scan(package: Path) -> None:
+    """Rescanning after edits gives what a full scan of the edits does."""
+    registry = Registry()
+    registry.scan("incremental_components", incremental=True)
+    assert snapshot(registry) == snapshot(full_scan())
+    greeting = import_target("incremental_components.kinds:Greeting")
+    hello = import_target("incremental_components.a:Hello")
+    assert registry.get(greeting).salutation == "Ciao"
+    kind_groups = registry.registrations[greeting]
+
+    # Nothing changed, nothing to do.
+    write(package / "a.py", HELLO, tick=1)
+    registry.scan("incremental_components", incremental=True)
+    assert registry.registrations[greeting] is kind_groups
+    assert import_target("incremental_components.kinds:Greeting") is greeting
+
+    # Change a module, add one, remove one.
+    write(package / "b.py", BONJOUR, tick=2)
+    write(package / "d.py", HOLA.replace("Hola", "Hej"), tick=2)
+    (package / "sub" / "c.py").unlink()
+    registry.scan("incremental_components", incremental=True)
+    expected = snapshot(full_scan())
+    assert snapshot(registry) == expected
+    kind = name(greeting)
+    assert len(expected[kind]["classes"][kind]) == 1
+    # What was taken out of the changed module is gone.
+    names = [i[0] for i in expected[kind]["classes"][name(IsNoneType)]]
+    assert names == [
+        "incremental_components.d:Hej",
+        "incremental_components.b:Bonjour",
+        "incremental_components.a:Hello",
+    ]
+    # Unchanged modules weren't imported again, so the kind and the
+    # implementations they define are the same classes.
+    assert import_target("incremental_components.kinds:Greeting") is greeting
+    assert import_target("incremental_components.a:Hello") is hello
+    assert registry.get(greeting).salutation == "Hej"
+    assert registry.get(greeting, context=greeting()).salutation == "Bonjour again"
+
+    # The removed module's registration is gone for good.
+    registry.scan("incremental_components", incremental=True)
+    assert snapshot(registry) == expected
+
+
+def test_incremental_scan_imports_from_changed_module(package: Path) -> None:
+    """Unchanged modules don't keep what they imported from changed ones."""
+    write(package / "b.py", GREETER)
+    registry = Registry()
+    registry.scan("incremental_components", incremental=True)
+    greeting = import_target("incremental_components.kinds:Greeting")
+    greeter = import_target("incremental_components.b:Greeter")
+    assert registry.get(greeter).greeting.salutation == "Hello"
+
+    # Only the module that ``b`` imports from is changed.
+    write(package / "a.py", HELLO.replace("pass", 'salutation = "Bonjour"'), tick=1)
+    registry.scan("incremental_components", incremental=True)
+    assert snapshot(registry) == snapshot(full_scan())
+    # ``b`` was imported again, ``kinds``, which imports neither, wasn't.
+    greeter = import_target("incremental_components.b:Greeter")
+    assert registry.get(greeter).greeting.salutation == "Bonjour"
+    assert import_target("incremental_components.kinds:Greeting") is greeting
+    assert registry.get(greeting).salutation == "Ciao"
+
+
+def test_incremental_scan_package_changed(package: Path) -> None:
+    """A package imported again still has its unchanged submodules."""
+    registry = Registry()
+    registry.scan("incremental_components", incremental=True)
+    kinds = sys.modules["incremental_components.kinds"]
+    write(package / "__init__.py", '"""Changed."""', tick=1)
+    registry.scan("incremental_components", incremental=True)
+    package_module = sys.modules["incremental_components"]
+    assert package_module.__doc__ == "Changed."
+    assert package_module.kinds is kinds
+    assert registry.get(kinds.Greeting).salutation == "Ciao"
+
+
+def test_incremental_scan_keeps_other_registrations(package: Path) -> None:
+    """Registrations that didn't come from the package stay put."""
+    registry = Registry()
+    registry.scan("incremental_components", incremental=True)
+    greeting = import_target("incremental_components.kinds:Greeting")
+    manual = type("Manual", (greeting,), {"salutation": "Manual"})
+    registry.register(manual, kind=greeting)
+    write(package / "b.py", BONJOUR, tick=1)
+    registry.scan("incremental_components", incremental=True)
+    implementations = [
+        cast(type, r.implementation)
+        for r in registry.registrations[greeting]["classes"][IsNoneType]
+    ]
+    assert [i.__name__ for i in implementations] == [
+        "Ciao",
+        "Bonjour",
+        "Hello",
+        "Manual",
+    ]
+
+
+def test_compact_keeps_incremental_registrations(package: Path) -> None:
+    """What an incremental scan may take away doesn't hide anything for good."""
+    greeting = import_target("incremental_components.kinds:Greeting")
+    old = type("Old", (greeting,), {"salutation": "Old"})
+    manual = type("Manual", (greeting,), {"salutation": "Manual"})
+    registry = Registry()
+    registry.register(old, kind=greeting)
+    registry.register(manual, kind=greeting)
+    registry.scan("incremental_components", incremental=True)
+    assert registry.compact() == 1
+
+    # Without the scanned modules, the manual registration is chosen.
+    (package / "sub" / "c.py").unlink()
+    (package / "b.py").unlink()
+    (package / "a.py").unlink()
+    registry.scan("incremental_components", incremental=True)
+    assert registry.get(greeting).salutation == "Manual"
@@ -0,0 +1,184 @@
+"""Stress the registry with threads reading while others register."""
+import gc
+import sys
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from threading import Barrier
+from threading import Event
+from threading import Thread
+
+import pytest
+from hopscotch import Registry
+from hopscotch.fixtures.dataklasses import AnotherGreeting
+from hopscotch.fixtures.dataklasses import Customer
+from hopscotch.fixtures.dataklasses import FrenchCustomer
+from hopscotch.fixtures.dataklasses import Greeting
+
+READERS = 8
+WRITES = 200
+
+
+@dataclass()
+class FrenchGreeting(Greeting):
+    """A greeting for a context."""
+
+    salutation: str = "Bonjour"
+
+
+@pytest.fixture(autouse=True)
+def _switch_often() -> Iterator[None]:
+    """Make threads switch often, to interleave reads and writes."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(targets: Sequence[Callable[[], object]]) -> list[BaseException]:
+    """Run the targets at once, returning what they raised."""
+    errors: list[BaseException] = []
+    barrier = Barrier(len(targets))
+
+    def run(target: Callable[[], object]) -> None:
+        barrier.wait()
+        try:
+            target()
+        except BaseException as exc:  # noqa: B036
+            errors.append(exc)
+
+    threads = [Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_get_while_registering() -> None:
+    """Readers always see a complete registry, before or after a write."""
+    parent = Registry()
+    parent.register(Greeting)
+    child = Registry(parent=parent, context=FrenchCustomer("marie"))
+    child.get(Greeting)
+    done = []
+
+    def write() -> None:
+        for index in range(WRITES):
+            if index % 2:
+                parent.register(FrenchGreeting, context=FrenchCustomer)
+            else:
+                child.register(AnotherGreeting, context=Customer)
+        done.append(True)
+
+    def read() -> None:
+        expected = (Greeting, AnotherGreeting, FrenchGreeting)
+        while not done:
+            assert type(child.get(Greeting)) in expected
+            assert type(parent.get(Greeting)) in (Greeting, FrenchGreeting)
+
+    errors = run_threads([write] + [read] * READERS)
+    assert errors == []
+    # Once the writes are over, everyone sees the same, latest, answer.
+    assert type(child.get(Greeting)) is AnotherGreeting
+    assert type(parent.get(Greeting, context=FrenchCustomer("marie"))) is (
+        FrenchGreeting
+    )
+    assert len(parent.registrations[Greeting]["classes"][FrenchCustomer]) == (
+        WRITES // 2
+    )
+
+
+def test_register_from_threads() -> None:
+    """Concurrent registrations are all kept."""
+    registry = Registry()
+
+    def write() -> None:
+        for _ in range(WRITES):
+            registry.register(Greeting)
+
+    errors = run_threads([write] * READERS)
+    assert errors == []
+    classes = registry.registrations[Greeting]["classes"]
+    assert len(classes[next(iter(classes))]) == WRITES * READERS
+
+
+def test_register_during_bulk() -> None:
+    """Another thread's bulk block doesn't hold back registrations."""
+    registry = Registry()
+    registry.register(Greeting)
+    in_block = Event()
+    registered = Event()
+    found: list[Customer] = []
+
+    def write_in_bulk() -> None:
+        with registry.bulk():
+            registry.register(AnotherGreeting, kind=Greeting)
+            in_block.set()
+            assert registered.wait(timeout=5)
+
+    def write() -> None:
+        assert in_block.wait(timeout=5)
+        registry.register(Customer(first_name="Mary"))
+        found.append(registry.get(Customer))
+        registered.set()
+
+    errors = run_threads([write_in_bulk, write])
+    assert errors == []
+    assert found[0].first_name == "Mary"
+    assert registry.get(Greeting).salutation == "Another Hello"
+
+
+def test_bulk_from_threads() -> None:
+    """Registrations in and out of bulk blocks, at once, are all kept."""
+    registry = Registry()
+
+    def write_in_bulk() -> None:
+        for _ in range(WRITES // 10):
+            with registry.bulk():
+                for _ in range(10):
+                    registry.register(Greeting)
+
+    def write() -> None:
+        for _ in range(WRITES):
+            registry.register(Greeting)
+
+    errors = run_threads([write_in_bulk, write] * (READERS // 2))
+    assert errors == []
+    classes = registry.registrations[Greeting]["classes"]
+    assert len(classes[next(iter(classes))]) == WRITES * READERS
+
+
+def test_tracking_from_threads() -> None:
+    """Threads sharing a tracker, and registries going away, keep it whole."""
+    registry = Registry(track_dependencies=True)
+    registry.register(Greeting, lifetime="registry")
+
+    def read() -> None:
+        for _ in range(WRITES):
+            Registry(parent=registry).get(Greeting)
+
+    def change() -> None:
+        for _ in range(WRITES):
+            registry.changed(Greeting)
+
+    errors = run_threads([read, change] * (READERS // 2))
+    assert errors == []
+    gc.collect()
+    registry.changed(Greeting)
+    assert registry.tracker is not None and len(registry.tracker) == 0
+
+
+def test_lifetime_from_threads() -> None:
+    """Threads racing to construct a scoped instance all get the same one."""
+    registry = Registry()
+    registry.register(Greeting, lifetime="registry")
+    results: list[Greeting] = []
+
+    def read() -> None:
+        results.append(registry.get(Greeting))
+
+    errors = run_threads([read] * READERS)
+    assert errors == []
+    assert len({id(result) for result in results}) == 1
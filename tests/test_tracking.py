@@ -0,0 +1,182 @@
+"""Test recording dependencies and invalidating what read them."""
+import gc
+from dataclasses import dataclass
+
+import pytest
+from hopscotch import Registry
+from hopscotch.fixtures.dataklasses import AnotherGreeting
+from hopscotch.fixtures.dataklasses import Customer
+from hopscotch.fixtures.dataklasses import Greeter
+from hopscotch.fixtures.dataklasses import Greeting
+from hopscotch.operators import Context
+from hopscotch.operators import context
+from hopscotch.tracking import DependencyTracker
+from hopscotch.tracking import record
+from hopscotch.tracking import recording
+from hopscotch.tracking import registration_dependency
+
+
+@dataclass(frozen=True)
+class Badge:
+    """An immutable component reading one attribute of the context."""
+
+    first_name: str = context(attr="first_name")
+
+
+def test_record_outside_recording() -> None:
+    """Recording with nothing being constructed is a no-op."""
+    record("ignored")
+    with recording() as reads:
+        pass
+    assert reads == set()
+
+
+def test_recording_nested() -> None:
+    """What an inner construction reads, the outer one read too."""
+    with recording() as outer:
+        record("outer")
+        with recording() as inner:
+            record("inner")
+    assert inner == {"inner"}
+    assert outer == {"outer", "inner"}
+
+
+def test_tracker_cascade() -> None:
+    """Evicting an instance also evicts what read its registration."""
+    evicted: list[str] = []
+    tracker = DependencyTracker()
+    tracker.add("o", 1, "greeting", Greeting, {"a"}, lambda: evicted.append("1"))
+    tracker.add("o", 2, "greeter", Greeter, {"b"}, lambda: evicted.append("2"))
+    greeter_dependency = {registration_dependency(Greeter)}
+    tracker.add(
+        "o", 3, "page", Customer, greeter_dependency, lambda: evicted.append("3")
+    )
+    assert sorted(tracker.changed("b")) == ["greeter", "page"]
+    assert sorted(evicted) == ["2", "3"]
+    assert tracker.dependents("a") == ["greeting"]
+    assert tracker.changed("b") == []
+
+
+def test_tracker_discard_owner() -> None:
+    """An owner's instances can be forgotten all at once."""
+    tracker = DependencyTracker()
+    tracker.add("first", 1, "greeting", Greeting, {"a"}, lambda: None)
+    tracker.add("second", 1, "greeting", Greeting, {"a"}, lambda: None)
+    tracker.discard_owner("first")
+    assert len(tracker) == 1
+    tracker.discard("second", 1)
+    assert len(tracker) == 0
+    assert tracker.dependents("a") == []
+
+
+def test_tracker_discard_owner_while_changing() -> None:
+    """An owner going away in the middle of a call is dropped after it."""
+    tracker = DependencyTracker()
+    tracker.add("first", 1, "greeting", Greeting, {"a"}, lambda: None)
+    for cache_key in range(3):
+        tracker.add(
+            "second",
+            cache_key,
+            "greeting",
+            Greeting,
+            {"b"},
+            # As a finalizer might, during garbage collection.
+            lambda: tracker.discard_owner("first"),
+        )
+    assert tracker.changed("b") == ["greeting"] * 3
+    assert len(tracker) == 0
+    assert tracker.dependents("a") == []
+
+
+def test_changed_not_tracking() -> None:
+    """Only a tracking registry can be told something changed."""
+    registry = Registry()
+    assert registry.tracker is None
+    with pytest.raises(ValueError) as exc:
+        registry.changed(Greeting)
+    assert exc.value.args[0] == "Registry is not tracking dependencies"
+
+
+def test_changed_registration() -> None:
+    """A changed registration evicts its instances and their dependents."""
+    registry = Registry(track_dependencies=True)
+    registry.register(Greeting, lifetime="registry")
+    registry.register(Greeter, lifetime="registry")
+    greeter = registry.get(Greeter)
+    greeting = registry.get(Greeting)
+    assert greeter.greeting is greeting
+
+    registration = registry.get_best_match(Greeting)
+    evicted = registry.changed(registration)
+    assert len(evicted) == 2
+    assert greeting in evicted and greeter in evicted
+    assert registry.get(Greeter) is not greeter
+    assert registry.get(Greeting) is not greeting
+
+
+def test_changed_unrelated() -> None:
+    """Changing something nothing read evicts nothing."""
+    registry = Registry(track_dependencies=True)
+    registry.register(Greeter, lifetime="registry")
+    greeter = registry.get(Greeter)
+    assert registry.changed(Customer) == []
+    assert registry.get(Greeter) is greeter
+
+
+def test_register_invalidates_readers() -> None:
+    """A new registration for a kind evicts instances that got that kind."""
+    registry = Registry(track_dependencies=True)
+    registry.register(Greeting)
+    registry.register(Greeter, lifetime="registry")
+    assert registry.get(Greeter).greeting.salutation == "Hello"
+    registry.register(AnotherGreeting, kind=Greeting)
+    assert registry.get(Greeter).greeting.salutation == "Another Hello"
+
+
+def test_changed_context_attribute() -> None:
+    """Instances reading a changed context attribute are evicted."""
+    customer = Customer(first_name="Mary")
+    registry = Registry(context=customer, track_dependencies=True)
+    registry.register(Badge, lifetime="registry")
+    badge = registry.get(Badge)
+    assert badge.first_name == "Mary"
+
+    assert registry.changed(Context("last_name")) == []
+    customer.first_name = "Fred"
+    assert registry.changed(Context("first_name")) == [badge]
+    assert registry.get(Badge).first_name == "Fred"
+
+    # Changing the whole context changes each attribute.
+    badge = registry.get(Badge)
+    assert registry.changed(Context()) == [badge]
+
+
+def test_changed_memoized() -> None:
+    """Memoized instances are tracked too."""
+    customer = Customer(first_name="Mary")
+    registry = Registry(context=customer, track_dependencies=True)
+    registry.register(Badge, memoize=True)
+    badge = registry.get(Badge)
+    assert registry.get(Badge) is badge
+    customer.first_name = "Fred"
+    assert registry.changed(Context("first_name")) == [badge]
+    assert registry.get(Badge).first_name == "Fred"
+
+
+def test_child_registry_tracking() -> None:
+    """Children share the tracker and their instances go with them."""
+    registry = Registry(track_dependencies=True)
+    registry.register(Greeter, lifetime="registry")
+    child = Registry(parent=registry)
+    assert child.tracker is registry.tracker
+    assert Registry(parent=registry, track_dependencies=False).tracker is None
+
+    greeter = child.get(Greeter)
+    assert registry.changed(Greeting) == [greeter]
+    child.get(Greeter)
+    tracker = registry.tracker
+    assert tracker is not None
+    assert len(tracker) == 1
+    del child
+    gc.collect()
+    assert len(tracker) == 0